@@ -1,8 +1,18 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
+from collections import defaultdict
 from dataclasses import dataclass
 import json
+import re
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+_TOKEN_RE = re.compile(r"\w+")
+
+# Slots drop the per-instance __dict__ (~100 bytes per card) and frozen
+# keeps published cards immutable; use dataclasses.replace for edits
+@dataclass(slots=True, frozen=True)
 class AgentCard:
     agent_id: str
     name: str
@@ -15,70 +25,129 @@ class AgentCard:
 class AgentRegistry:
     def __init__(self):
         self.agents: Dict[str, AgentCard] = {}
-    
-    async def register_agent(self, card: AgentCard):
+        # Inverted index: capability -> agent ids, so discovery is a dict
+        # lookup instead of a scan over every registered agent
+        self._by_capability: Dict[str, Set[str]] = defaultdict(set)
+        # Inverted index: name/description token -> agent ids, for search
+        self._token_index: Dict[str, Set[str]] = defaultdict(set)
+        # Lowercased searchable text per agent, for the substring
+        # fallback when token intersection finds nothing
+        self._search_text: Dict[str, str] = {}
+        # Memoized to_json output, invalidated on register/unregister
+        self._json_cache: Optional[str] = None
+        # Bumped on every mutation so clients can cache lookups safely
+        self._version: int = 0
+
+    def _index_tokens(self, card: AgentCard):
+        """Add an agent's name/description tokens to the search index"""
+        text = f"{card.name} {card.description}".lower()
+        self._search_text[card.agent_id] = text
+        for token in _TOKEN_RE.findall(text):
+            self._token_index[token].add(card.agent_id)
+
+    def _unindex_tokens(self, card: AgentCard):
+        """Remove an agent's name/description tokens from the search index"""
+        text = self._search_text.pop(card.agent_id,
+                                     f"{card.name} {card.description}".lower())
+        for token in _TOKEN_RE.findall(text):
+            self._token_index[token].discard(card.agent_id)
+
+    def register_agent(self, card: AgentCard):
         """Register agent in distributed registry"""
         self.agents[card.agent_id] = card
+        for capability in card.capabilities:
+            self._by_capability[capability].add(card.agent_id)
+        self._index_tokens(card)
+        self._json_cache = None
+        self._version += 1
         print(f"Registered agent: {card.name} ({card.agent_id})")
-    
-    async def discover_agents(self, capability: str) -> List[AgentCard]:
+
+    def discover_agents(self, capability: str) -> List[AgentCard]:
         """Find agents with specific capability"""
-        matching_agents = [
-            agent for agent in self.agents.values() 
-            if capability in agent.capabilities
-        ]
-        return matching_agents
-    
-    async def get_agent(self, agent_id: str) -> Optional[AgentCard]:
+        return [self.agents[agent_id] for agent_id in self._by_capability.get(capability, ())]
+
+    def get_agent(self, agent_id: str) -> Optional[AgentCard]:
         """Get agent by ID"""
         return self.agents.get(agent_id)
-    
-    async def unregister_agent(self, agent_id: str):
+
+    def unregister_agent(self, agent_id: str):
         """Unregister agent from registry"""
         if agent_id in self.agents:
-            del self.agents[agent_id]
+            card = self.agents.pop(agent_id)
+            for capability in card.capabilities:
+                self._by_capability[capability].discard(agent_id)
+            self._unindex_tokens(card)
+            self._json_cache = None
+            self._version += 1
             print(f"Unregistered agent: {agent_id}")
     
-    async def list_all_agents(self) -> List[AgentCard]:
+    def list_all_agents(self) -> List[AgentCard]:
         """List all registered agents"""
         return list(self.agents.values())
     
-    async def search_agents(self, query: str) -> List[AgentCard]:
+    def search_agents(self, query: str) -> List[AgentCard]:
         """Search agents by name or description"""
         query_lower = query.lower()
-        matching_agents = []
-        
-        for agent in self.agents.values():
-            if (query_lower in agent.name.lower() or 
-                query_lower in agent.description.lower()):
-                matching_agents.append(agent)
-        
-        return matching_agents
+        query_tokens = _TOKEN_RE.findall(query_lower)
+        if not query_tokens:
+            return []
+
+        # Intersect the posting lists; every query token must appear in the
+        # agent's name or description
+        matching_ids = self._token_index.get(query_tokens[0], set())
+        for token in query_tokens[1:]:
+            matching_ids = matching_ids & self._token_index.get(token, set())
+            if not matching_ids:
+                break
+
+        if matching_ids:
+            return [self.agents[agent_id] for agent_id in matching_ids]
+
+        # No whole-token hit: fall back to a substring scan over the
+        # cached lowercased text so partial words ("sear") still match;
+        # the registry is small enough for this rare path
+        return [
+            self.agents[agent_id]
+            for agent_id, text in self._search_text.items()
+            if query_lower in text
+        ]
     
     def to_json(self) -> str:
         """Export registry to JSON"""
-        agents_dict = {
-            agent_id: {
-                "agent_id": card.agent_id,
-                "name": card.name,
-                "description": card.description,
-                "capabilities": card.capabilities,
-                "endpoints": card.endpoints,
-                "authentication": card.authentication,
-                "metadata": card.metadata
+        if self._json_cache is not None:
+            return self._json_cache
+
+        if orjson is not None:
+            # orjson serializes dataclasses natively, so no intermediate
+            # per-card dicts are built
+            self._json_cache = orjson.dumps(self.agents).decode()
+        else:
+            agents_dict = {
+                agent_id: {
+                    "agent_id": card.agent_id,
+                    "name": card.name,
+                    "description": card.description,
+                    "capabilities": card.capabilities,
+                    "endpoints": card.endpoints,
+                    "authentication": card.authentication,
+                    "metadata": card.metadata
+                }
+                for agent_id, card in self.agents.items()
             }
-            for agent_id, card in self.agents.items()
-        }
-        return json.dumps(agents_dict, indent=2)
-    
+            self._json_cache = json.dumps(agents_dict, separators=(",", ":"))
+        return self._json_cache
+
     @classmethod
     def from_json(cls, json_data: str) -> 'AgentRegistry':
         """Load registry from JSON"""
         registry = cls()
-        data = json.loads(json_data)
-        
+        data = orjson.loads(json_data) if orjson is not None else json.loads(json_data)
+
         for agent_id, agent_data in data.items():
             card = AgentCard(**agent_data)
             registry.agents[agent_id] = card
-        
-        return registry 
\ No newline at end of file
+            for capability in card.capabilities:
+                registry._by_capability[capability].add(agent_id)
+            registry._index_tokens(card)
+
+        return registry
\ No newline at end of file
@@ -1,30 +1,68 @@
 from typing import Dict, Any, Optional
 from .agent_registry import AgentRegistry, AgentCard
 import asyncio
+import collections
+import itertools
 import json
-from datetime import datetime
+import time
+from datetime import datetime, timezone
+
+# Bound once at import so hot paths use LOAD_FAST/LOAD_GLOBAL instead of
+# a global-plus-attribute lookup per call
+_from_timestamp = datetime.fromtimestamp
+_time_ns = time.time_ns
+
+def _iso_from_ns(ts_ns: int) -> str:
+    """Format a time.time_ns() value as an ISO-8601 UTC timestamp"""
+    return _from_timestamp(ts_ns / 1e9, tz=timezone.utc).isoformat()
 
 class A2AClient:
     def __init__(self, agent_id: str, registry: AgentRegistry):
         self.agent_id = agent_id
         self.registry = registry
-        self.status_listeners = {}
-        self.message_queue = asyncio.Queue()
+        # agent_id -> (queue, consumer task); each subscriber drains its own
+        # queue so a slow consumer never stalls the broadcaster
+        self.status_listeners: Dict[str, tuple] = {}
+        # Plain deque mailbox with an Event for wake-up: append/popleft are
+        # lock-free C operations, so in-process hand-off costs no Future
+        # allocation the way asyncio.Queue.put does
+        self._mq: collections.deque = collections.deque()
+        self._mq_event = asyncio.Event()
+        # Monotonic sequence for collision-free message ids
+        self._id_seq = itertools.count()
+        # agent_id -> (registry version, card); entries are reused as long
+        # as the registry has not mutated since the lookup
+        self._card_cache: Dict[str, tuple] = {}
+
+    def _next_msg_id(self) -> str:
+        """Generate a unique message id for this client"""
+        return f"{self.agent_id}-{next(self._id_seq):x}"
+
+    def _get_card(self, agent_id: str) -> Optional[AgentCard]:
+        """Look up an agent card, caching against the registry version"""
+        version = self.registry._version
+        cached = self._card_cache.get(agent_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        card = self.registry.get_agent(agent_id)
+        self._card_cache[agent_id] = (version, card)
+        return card
     
     async def delegate_task(self, target_agent: str, task: Dict) -> Dict:
         """Delegate task to another agent"""
-        target_card = await self.registry.get_agent(target_agent)
+        target_card = self._get_card(target_agent)
         if not target_card:
             raise ValueError(f"Agent {target_agent} not found in registry")
         
-        # Prepare task message
+        # Prepare task message; read the clock once per message
         message = {
             "from": self.agent_id,
             "to": target_agent,
             "type": "task_delegation",
             "task": task,
-            "timestamp": datetime.now().isoformat(),
-            "message_id": f"{self.agent_id}_{target_agent}_{datetime.now().timestamp()}"
+            "timestamp": _iso_from_ns(_time_ns()),
+            "message_id": self._next_msg_id()
         }
         
         try:
@@ -41,30 +79,41 @@ class A2AClient:
             "from": self.agent_id,
             "type": "status_update",
             "status": status,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_from_ns(_time_ns())
         }
         
-        # Broadcast to all agents that have registered interest
-        for listener_id in self.status_listeners.keys():
-            try:
-                await self._send_status_update(listener_id, message)
-            except Exception as e:
-                print(f"Failed to send status to {listener_id}: {str(e)}")
-    
+        # Publish once: the same message object is shared by reference with
+        # every subscriber queue, and per-subscriber consumer tasks handle
+        # delivery independently of the broadcaster
+        for queue, _task in self.status_listeners.values():
+            queue.put_nowait(message)
+
     async def subscribe_to_status(self, agent_id: str):
         """Subscribe to status updates from another agent"""
-        self.status_listeners[agent_id] = True
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(self._consume_status_updates(agent_id, queue))
+        self.status_listeners[agent_id] = (queue, task)
         print(f"Subscribed to status updates from {agent_id}")
-    
+
     async def unsubscribe_from_status(self, agent_id: str):
         """Unsubscribe from status updates from another agent"""
         if agent_id in self.status_listeners:
-            del self.status_listeners[agent_id]
+            _queue, task = self.status_listeners.pop(agent_id)
+            task.cancel()
             print(f"Unsubscribed from status updates from {agent_id}")
+
+    async def _consume_status_updates(self, agent_id: str, queue: asyncio.Queue):
+        """Drain one subscriber's status queue and deliver its updates"""
+        while True:
+            message = await queue.get()
+            try:
+                await self._send_status_update(agent_id, message)
+            except Exception as e:
+                print(f"Failed to send status to {agent_id}: {str(e)}")
     
     async def send_direct_message(self, target_agent: str, message: str) -> Dict:
         """Send direct message to another agent"""
-        target_card = await self.registry.get_agent(target_agent)
+        target_card = self._get_card(target_agent)
         if not target_card:
             raise ValueError(f"Agent {target_agent} not found in registry")
         
@@ -73,8 +122,8 @@ class A2AClient:
             "to": target_agent,
             "type": "direct_message",
             "content": message,
-            "timestamp": datetime.now().isoformat(),
-            "message_id": f"{self.agent_id}_{target_agent}_{datetime.now().timestamp()}"
+            "timestamp": _iso_from_ns(_time_ns()),
+            "message_id": self._next_msg_id()
         }
         
         try:
@@ -92,22 +141,25 @@ class A2AClient:
         return {
             "status": "delivered",
             "response": f"Message delivered to {target_card.agent_id}",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_from_ns(_time_ns())
         }
     
     async def _send_status_update(self, target_agent: str, message: Dict):
         """Send status update to a specific agent"""
-        target_card = await self.registry.get_agent(target_agent)
+        target_card = self._get_card(target_agent)
         if target_card:
             await self._send_message(target_card, message)
     
     async def receive_messages(self) -> Optional[Dict]:
         """Receive incoming messages"""
+        if self._mq:
+            return self._mq.popleft()
         try:
-            message = await asyncio.wait_for(self.message_queue.get(), timeout=1.0)
-            return message
+            await asyncio.wait_for(self._mq_event.wait(), timeout=1.0)
         except asyncio.TimeoutError:
             return None
+        self._mq_event.clear()
+        return self._mq.popleft() if self._mq else None
     
     async def handle_incoming_message(self, message: Dict) -> Dict:
         """Handle incoming message from another agent"""
@@ -124,8 +176,9 @@ class A2AClient:
     
     async def _handle_task_delegation(self, message: Dict) -> Dict:
         """Handle incoming task delegation"""
-        # Add to message queue for processing by the agent
-        await self.message_queue.put(message)
+        # Add to the mailbox for processing by the agent
+        self._mq.append(message)
+        self._mq_event.set()
         return {"status": "accepted", "message": "Task delegation received"}
     
     async def _handle_status_update(self, message: Dict) -> Dict:
@@ -136,5 +189,6 @@ class A2AClient:
     async def _handle_direct_message(self, message: Dict) -> Dict:
         """Handle incoming direct message"""
         print(f"Direct message from {message['from']}: {message['content']}")
-        await self.message_queue.put(message)
+        self._mq.append(message)
+        self._mq_event.set()
         return {"status": "received"} 
\ No newline at end of file
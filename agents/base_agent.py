@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from typing import Dict, List, Any, Optional
 from llm_providers.base import BaseLLMProvider
 from mcp_integration.server import MCPServerManager
 from a2a_protocol.communication import A2AClient
+import asyncio
+import time
 
 class BaseAgent(ABC):
     def __init__(self, agent_id: str, llm_provider: BaseLLMProvider, 
@@ -31,7 +34,7 @@ class BaseAgent(ABC):
         """Register tools with MCP server"""
         for tool_name in self.tools:
             # In a real implementation, this would register actual tool functions
-            await self.mcp_manager.register_tool(
+            self.mcp_manager.register_tool(
                 tool_name, 
                 self._get_tool_function(tool_name),
                 self._get_tool_schema(tool_name)
@@ -51,7 +54,7 @@ class BaseAgent(ABC):
             metadata={"version": "1.0.0", "tools": self.tools}
         )
         
-        await self.a2a_client.registry.register_agent(card)
+        self.a2a_client.registry.register_agent(card)
     
     def _get_tool_function(self, tool_name: str):
         """Get the function for a specific tool"""
@@ -77,15 +80,23 @@ class BaseAgent(ABC):
             }
         }
     
-    async def update_memory(self, key: str, value: Any):
+    def update_memory(self, key: str, value: Any):
         """Update agent memory"""
         self.memory[key] = value
     
-    async def get_memory(self, key: str) -> Any:
+    def update_memory_bulk(self, pairs: Dict[str, Any]):
+        """Update several memory keys in one pass"""
+        self.memory.update(pairs)
+    
+    def get_memory(self, key: str) -> Any:
         """Get value from agent memory"""
         return self.memory.get(key)
     
-    async def clear_memory(self):
+    def get_memory_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Read several memory keys in one pass"""
+        return {key: self.memory.get(key) for key in keys}
+    
+    def clear_memory(self):
         """Clear agent memory"""
         self.memory.clear()
     
@@ -104,6 +115,31 @@ class BaseAgent(ABC):
         self.status = status
         await self.a2a_client.broadcast_status({"agent_id": self.agent_id, "status": status})
     
+    @asynccontextmanager
+    async def status_scope(self, status: str):
+        """Run a block under one status with a single broadcast on exit
+
+        The working status is set locally on entry; subscribers get one
+        combined event carrying the final status and duration instead of
+        separate entry and exit updates.
+        """
+        started = time.monotonic()
+        self.status = status
+        try:
+            yield
+        except Exception:
+            self.status = "error"
+            raise
+        else:
+            self.status = "idle"
+        finally:
+            await self.a2a_client.broadcast_status({
+                "agent_id": self.agent_id,
+                "status": self.status,
+                "completed": status,
+                "duration": time.monotonic() - started
+            })
+    
     async def delegate_to_other_agent(self, target_agent: str, task: Dict) -> Dict:
         """Delegate a task to another agent"""
         try:
@@ -112,22 +148,35 @@ class BaseAgent(ABC):
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    # Cap on in-flight delegations during multi-agent collaboration
+    MAX_COLLABORATION_CONCURRENCY = 32
+
     async def collaborate_with_agents(self, agent_ids: List[str], task: Dict) -> Dict:
         """Collaborate with multiple agents on a task"""
+        semaphore = asyncio.Semaphore(self.MAX_COLLABORATION_CONCURRENCY)
+
+        async def delegate_one(agent_id: str) -> Dict:
+            async with semaphore:
+                return await self.delegate_to_other_agent(agent_id, task)
+
+        # Fan out all delegations concurrently, bounded by the semaphore
+        outcomes = await asyncio.gather(
+            *(delegate_one(agent_id) for agent_id in agent_ids),
+            return_exceptions=True
+        )
+
         results = {}
-        
-        for agent_id in agent_ids:
-            try:
-                result = await self.delegate_to_other_agent(agent_id, task)
-                results[agent_id] = result
-            except Exception as e:
-                results[agent_id] = {"success": False, "error": str(e)}
-        
+        for agent_id, outcome in zip(agent_ids, outcomes):
+            if isinstance(outcome, Exception):
+                results[agent_id] = {"success": False, "error": str(outcome)}
+            else:
+                results[agent_id] = outcome
+
         return results
     
     async def shutdown(self):
         """Shutdown the agent gracefully"""
         await self.set_status("shutting_down")
-        await self.a2a_client.registry.unregister_agent(self.agent_id)
-        await self.clear_memory()
+        self.a2a_client.registry.unregister_agent(self.agent_id)
+        self.clear_memory()
         print(f"Agent {self.agent_id} shut down successfully") 
\ No newline at end of file
@@ -3,10 +3,55 @@ from .base_agent import BaseAgent
 from llm_providers.base import BaseLLMProvider, LLMConfig
 from mcp_integration.server import MCPServerManager
 from a2a_protocol.communication import A2AClient
+import asyncio
 import json
+import re
 from datetime import datetime, timedelta
 
+# Module-level aliases keep the per-call lookups on the handler hot
+# paths to a single LOAD_GLOBAL
+_dumps = json.dumps
+_now = datetime.now
+
+def _fmt_context(context: Dict) -> str:
+    """Format prompt context compactly; empty context costs no tokens"""
+    return "none" if not context else _dumps(context, separators=(",", ":"))
+
 class PlanningAgent(BaseAgent):
+    # Static per-handler LLM configs, allocated once instead of per call
+    _CFG_DECOMPOSITION = LLMConfig(model_name="claude-3-sonnet", temperature=0.3)  # Good for structured thinking
+    _CFG_WORKFLOW = LLMConfig(model_name="claude-3-sonnet", temperature=0.2)
+    _CFG_ALLOCATION = LLMConfig(model_name="gpt-4", temperature=0.3)
+    _CFG_TIMELINE = LLMConfig(model_name="gpt-4", temperature=0.2)
+
+    # Precompiled (task_type, keyword, handler) dispatch for process_task;
+    # the message is lowercased once and scanned in declaration order
+    _TASK_DISPATCH = (
+        ("task_decomposition", "break down", "_decompose_task"),
+        ("workflow_planning", "plan", "_create_workflow_plan"),
+        ("resource_allocation", "resource", "_allocate_resources"),
+        (None, "schedule", "_create_timeline"),
+        (None, "timeline", "_create_timeline"),
+    )
+
+    # Keyword -> handler dispatch for _general_planning; compiled into a
+    # single alternation so classification is one C-level scan. Note:
+    # classification is leftmost-keyword — the earliest keyword in the
+    # message wins, not the table order, so "allocate resources for the
+    # new process" routes to allocation where the original if/elif chain
+    # checked workflow/process first
+    _GENERAL_DISPATCH = {
+        "break": "_decompose_task",
+        "decompose": "_decompose_task",
+        "workflow": "_create_workflow_plan",
+        "process": "_create_workflow_plan",
+        "resource": "_allocate_resources",
+        "allocate": "_allocate_resources",
+        "timeline": "_create_timeline",
+        "schedule": "_create_timeline",
+    }
+    _GENERAL_RE = re.compile("|".join(_GENERAL_DISPATCH), re.IGNORECASE)
+
     def __init__(self, agent_id: str, llm_provider: BaseLLMProvider, 
                  mcp_manager: MCPServerManager, a2a_client: A2AClient):
         super().__init__(agent_id, llm_provider, mcp_manager, a2a_client)
@@ -18,25 +63,19 @@ class PlanningAgent(BaseAgent):
         task_type = task.get("type", "general")
         message = task.get("message", "")
         
-        await self.set_status("processing")
-        
         try:
-            if task_type == "task_decomposition" or "break down" in message.lower():
-                result = await self._decompose_task(task)
-            elif task_type == "workflow_planning" or "plan" in message.lower():
-                result = await self._create_workflow_plan(task)
-            elif task_type == "resource_allocation" or "resource" in message.lower():
-                result = await self._allocate_resources(task)
-            elif "schedule" in message.lower() or "timeline" in message.lower():
-                result = await self._create_timeline(task)
-            else:
-                result = await self._general_planning(task)
+            async with self.status_scope("processing"):
+                message_lower = message.lower()
+                for dispatch_type, keyword, handler_name in self._TASK_DISPATCH:
+                    if task_type == dispatch_type or keyword in message_lower:
+                        result = await getattr(self, handler_name)(task)
+                        break
+                else:
+                    result = await self._general_planning(task)
             
-            await self.set_status("idle")
             return {"success": True, "result": result, "agent": self.agent_id}
         
         except Exception as e:
-            await self.set_status("error")
             return {"success": False, "error": str(e), "agent": self.agent_id}
     
     async def _decompose_task(self, task: Dict) -> str:
@@ -44,18 +83,13 @@ class PlanningAgent(BaseAgent):
         main_task = task.get("message", "")
         context = task.get("context", {})
         
-        await self.update_memory("current_decomposition", main_task)
-        
-        llm_config = LLMConfig(
-            model_name="claude-3-sonnet",  # Good for structured thinking
-            temperature=0.3
-        )
+        self.update_memory("current_decomposition", main_task)
         
         decomposition_prompt = f"""
         You are an expert project manager. Break down this complex task into manageable subtasks:
         
         Main Task: "{main_task}"
-        Context: {json.dumps(context, indent=2)}
+        Context: {_fmt_context(context)}
         
         Provide:
         1. Clear task breakdown structure (WBS)
@@ -70,14 +104,14 @@ class PlanningAgent(BaseAgent):
         try:
             decomposition = await self.llm_provider.generate_response(
                 [{"role": "user", "content": decomposition_prompt}],
-                llm_config
+                self._CFG_DECOMPOSITION
             )
             
             # Store the decomposition for future reference
-            await self.update_memory("last_decomposition", {
+            self.update_memory("last_decomposition", {
                 "task": main_task,
                 "breakdown": decomposition,
-                "created_at": datetime.now().isoformat()
+                "created_at": _now().isoformat()
             })
             
             return decomposition
@@ -90,18 +124,13 @@ class PlanningAgent(BaseAgent):
         project_description = task.get("message", "")
         requirements = task.get("context", {})
         
-        await self.update_memory("current_workflow", project_description)
-        
-        llm_config = LLMConfig(
-            model_name="claude-3-sonnet",
-            temperature=0.2
-        )
+        self.update_memory("current_workflow", project_description)
         
         workflow_prompt = f"""
         Create a comprehensive workflow plan for this project:
         
         Project: "{project_description}"
-        Requirements: {json.dumps(requirements, indent=2)}
+        Requirements: {_fmt_context(requirements)}
         
         Include:
         1. Project phases and milestones
@@ -118,13 +147,13 @@ class PlanningAgent(BaseAgent):
         try:
             workflow = await self.llm_provider.generate_response(
                 [{"role": "user", "content": workflow_prompt}],
-                llm_config
+                self._CFG_WORKFLOW
             )
             
-            await self.update_memory("last_workflow", {
+            self.update_memory("last_workflow", {
                 "project": project_description,
                 "plan": workflow,
-                "created_at": datetime.now().isoformat()
+                "created_at": _now().isoformat()
             })
             
             return workflow
@@ -137,18 +166,13 @@ class PlanningAgent(BaseAgent):
         project_info = task.get("message", "")
         available_resources = task.get("context", {}).get("resources", {})
         
-        await self.update_memory("current_allocation", project_info)
-        
-        llm_config = LLMConfig(
-            model_name="gpt-4",
-            temperature=0.3
-        )
+        self.update_memory("current_allocation", project_info)
         
         allocation_prompt = f"""
         Plan optimal resource allocation for this project:
         
         Project: "{project_info}"
-        Available Resources: {json.dumps(available_resources, indent=2)}
+        Available Resources: {_fmt_context(available_resources)}
         
         Provide:
         1. Human resource allocation
@@ -165,14 +189,14 @@ class PlanningAgent(BaseAgent):
         try:
             allocation = await self.llm_provider.generate_response(
                 [{"role": "user", "content": allocation_prompt}],
-                llm_config
+                self._CFG_ALLOCATION
             )
             
-            await self.update_memory("last_allocation", {
+            self.update_memory("last_allocation", {
                 "project": project_info,
                 "allocation": allocation,
                 "resources": available_resources,
-                "created_at": datetime.now().isoformat()
+                "created_at": _now().isoformat()
             })
             
             return allocation
@@ -180,20 +204,19 @@ class PlanningAgent(BaseAgent):
         except Exception as e:
             return f"Error allocating resources: {str(e)}"
     
-    async def _create_timeline(self, task: Dict) -> str:
+    async def _create_timeline(self, task: Dict, decomposition: str = None) -> str:
         """Create project timeline and schedule"""
         project_description = task.get("message", "")
         deadline = task.get("context", {}).get("deadline")
-        
-        await self.update_memory("current_timeline", project_description)
-        
-        # First decompose the task to get subtasks
-        decomposition_result = await self._decompose_task(task)
-        
-        llm_config = LLMConfig(
-            model_name="gpt-4",
-            temperature=0.2
-        )
+
+        self.update_memory("current_timeline", project_description)
+
+        # Reuse a precomputed decomposition when the caller already has one;
+        # otherwise decompose the task to get subtasks
+        if decomposition is not None:
+            decomposition_result = decomposition
+        else:
+            decomposition_result = await self._decompose_task(task)
         
         timeline_prompt = f"""
         Create a detailed project timeline based on this task breakdown:
@@ -217,14 +240,14 @@ class PlanningAgent(BaseAgent):
         try:
             timeline = await self.llm_provider.generate_response(
                 [{"role": "user", "content": timeline_prompt}],
-                llm_config
+                self._CFG_TIMELINE
             )
             
-            await self.update_memory("last_timeline", {
+            self.update_memory("last_timeline", {
                 "project": project_description,
                 "timeline": timeline,
                 "deadline": deadline,
-                "created_at": datetime.now().isoformat()
+                "created_at": _now().isoformat()
             })
             
             return timeline
@@ -236,46 +259,46 @@ class PlanningAgent(BaseAgent):
         """Handle general planning requests"""
         message = task.get("message", "")
         
-        # Determine the best planning approach
-        if "break" in message.lower() or "decompose" in message.lower():
-            return await self._decompose_task(task)
-        elif "workflow" in message.lower() or "process" in message.lower():
-            return await self._create_workflow_plan(task)
-        elif "resource" in message.lower() or "allocate" in message.lower():
-            return await self._allocate_resources(task)
-        elif "timeline" in message.lower() or "schedule" in message.lower():
-            return await self._create_timeline(task)
-        else:
-            # Comprehensive planning
-            decomposition = await self._decompose_task(task)
-            workflow = await self._create_workflow_plan(task)
-            timeline = await self._create_timeline(task)
-            
-            return f"""
-            Comprehensive Planning Report:
-            
-            TASK BREAKDOWN:
-            {decomposition}
-            
-            WORKFLOW PLAN:
-            {workflow}
-            
-            PROJECT TIMELINE:
-            {timeline}
-            """
+        # Determine the best planning approach with a single compiled
+        # scan; the earliest keyword in the message decides
+        match = self._GENERAL_RE.search(message)
+        if match:
+            handler_name = self._GENERAL_DISPATCH[match.group(0).lower()]
+            return await getattr(self, handler_name)(task)
+
+        # Comprehensive planning: decompose once, then run the workflow
+        # and timeline calls concurrently against the shared breakdown
+        decomposition = await self._decompose_task(task)
+        workflow, timeline = await asyncio.gather(
+            self._create_workflow_plan(task),
+            self._create_timeline(task, decomposition=decomposition)
+        )
+
+        return f"""
+        Comprehensive Planning Report:
+
+        TASK BREAKDOWN:
+        {decomposition}
+
+        WORKFLOW PLAN:
+        {workflow}
+
+        PROJECT TIMELINE:
+        {timeline}
+        """
     
     async def get_planning_history(self) -> Dict[str, Any]:
         """Get history of planning activities"""
         return {
-            "last_decomposition": await self.get_memory("last_decomposition"),
-            "last_workflow": await self.get_memory("last_workflow"),
-            "last_allocation": await self.get_memory("last_allocation"),
-            "last_timeline": await self.get_memory("last_timeline"),
+            "last_decomposition": self.get_memory("last_decomposition"),
+            "last_workflow": self.get_memory("last_workflow"),
+            "last_allocation": self.get_memory("last_allocation"),
+            "last_timeline": self.get_memory("last_timeline"),
             "current_project": {
-                "decomposition": await self.get_memory("current_decomposition"),
-                "workflow": await self.get_memory("current_workflow"),
-                "allocation": await self.get_memory("current_allocation"),
-                "timeline": await self.get_memory("current_timeline")
+                "decomposition": self.get_memory("current_decomposition"),
+                "workflow": self.get_memory("current_workflow"),
+                "allocation": self.get_memory("current_allocation"),
+                "timeline": self.get_memory("current_timeline")
             }
         }
     
@@ -3,6 +3,68 @@ from .base_agent import BaseAgent
 from llm_providers.base import BaseLLMProvider, LLMConfig
 from mcp_integration.server import MCPServerManager
 from a2a_protocol.communication import A2AClient
+import json
+import re
+
+# One case-insensitive scan replaces the chain of lower()+substring
+# checks. Note: classification is leftmost-keyword — the earliest
+# keyword in the message decides the handler, not the alternation
+# order, so "analyze the search results" routes to analysis where the
+# original if/elif chain checked search first
+_KEYWORD_RE = re.compile(r"search|find|analyze|examine|report", re.IGNORECASE)
+
+# Static system prompts are module-level constants so every request shares
+# a byte-identical prefix: provider prompt caches only match exact shared
+# prefixes, so the persona/instruction block goes first and the variable
+# query arrives as the trailing user message.
+RESEARCH_SYSTEM = """You are a research assistant specialized in devising search strategies.
+
+For every query you receive:
+1. Break down the search into key topics
+2. Suggest refined search terms
+3. Identify what types of sources would be most valuable
+
+Respond with a structured search plan."""
+
+ANALYSIS_SYSTEM = """You are a data analyst. Analyze the data description you receive.
+
+Provide:
+1. Key patterns and trends
+2. Statistical insights
+3. Actionable recommendations
+4. Potential limitations or caveats
+
+Structure your analysis professionally."""
+
+COMBINED_SYSTEM = """You are a research assistant. For the request you receive, produce in one pass:
+(A) a structured search plan with simulated results, and
+(B) an analysis of those findings with key patterns, insights, recommendations, and caveats.
+
+Return a JSON object with exactly two string fields: "search" and "analysis"."""
+
+REPORT_SYSTEM = """You are a research writer. Generate a comprehensive research report on the topic and search results you receive.
+
+Structure the report with:
+1. Executive Summary
+2. Background and Context
+3. Key Findings
+4. Analysis and Insights
+5. Recommendations
+6. Conclusion
+
+Make it professional and well-researched."""
+
+# Constant fragments of the report user message; joined with the dynamic
+# topic and results instead of re-parsing an f-string template per call
+_REPORT_USER_HEAD = 'Topic: "'
+_REPORT_USER_MID = '"\n\nSearch results: '
+
+# Prebuilt system message dicts: one shared object per prompt instead of a
+# fresh dict allocation on every call
+_MSG_RESEARCH = {"role": "system", "content": RESEARCH_SYSTEM}
+_MSG_ANALYSIS = {"role": "system", "content": ANALYSIS_SYSTEM}
+_MSG_COMBINED = {"role": "system", "content": COMBINED_SYSTEM}
+_MSG_REPORT = {"role": "system", "content": REPORT_SYSTEM}
 
 class ResearchAgent(BaseAgent):
     def __init__(self, agent_id: str, llm_provider: BaseLLMProvider, 
@@ -10,54 +72,65 @@ class ResearchAgent(BaseAgent):
         super().__init__(agent_id, llm_provider, mcp_manager, a2a_client)
         self.capabilities = ["web_search", "data_analysis", "report_generation"]
         self.tools = ["web_search", "pdf_reader", "database_query", "summarize"]
+        # Per-method configs built once; the cache key groups requests from
+        # this agent/task-type so they land on the same provider cache shard
+        self._cfg_search = LLMConfig(
+            model_name="gpt-3.5-turbo",  # Default model
+            temperature=0.3,
+            prompt_cache_key=f"{agent_id}:web_search"
+        )
+        self._cfg_analysis = LLMConfig(
+            model_name="gpt-4",  # Use more capable model for analysis
+            temperature=0.2,
+            prompt_cache_key=f"{agent_id}:data_analysis"
+        )
+        self._cfg_report = LLMConfig(
+            model_name="gpt-4",
+            temperature=0.4,
+            prompt_cache_key=f"{agent_id}:report_generation"
+        )
+        self._cfg_combined = LLMConfig(
+            model_name="gpt-4",
+            temperature=0.3,
+            prompt_cache_key=f"{agent_id}:search_analyze",
+            additional_params={"response_format": {"type": "json_object"}}
+        )
     
     async def process_task(self, task: Dict) -> Dict:
         """Handle research-specific tasks"""
         task_type = task.get("type", "general")
-        
-        await self.set_status("processing")
+        message = task.get("message", "")
         
         try:
-            if task_type == "web_search" or "search" in task.get("message", "").lower():
-                result = await self._perform_web_search(task.get("query", task.get("message", "")))
-            elif task_type == "data_analysis" or "analyze" in task.get("message", "").lower():
-                result = await self._analyze_data(task.get("data", task.get("message", "")))
-            elif task_type == "report_generation" or "report" in task.get("message", "").lower():
-                result = await self._generate_report(task)
-            else:
-                result = await self._general_research(task)
+            async with self.status_scope("processing"):
+                match = _KEYWORD_RE.search(message)
+                keyword = match.group(0).lower() if match else None
+                
+                if task_type == "web_search" or keyword in ("search", "find"):
+                    result = await self._perform_web_search(task.get("query", message))
+                elif task_type == "data_analysis" or keyword in ("analyze", "examine"):
+                    result = await self._analyze_data(task.get("data", message))
+                elif task_type == "report_generation" or keyword == "report":
+                    result = await self._generate_report(task)
+                else:
+                    result = await self._general_research(task)
             
-            await self.set_status("idle")
             return {"success": True, "result": result, "agent": self.agent_id}
         
         except Exception as e:
-            await self.set_status("error")
             return {"success": False, "error": str(e), "agent": self.agent_id}
     
     async def _perform_web_search(self, query: str) -> str:
         """Perform web search for information"""
-        await self.update_memory("last_search_query", query)
-        
-        # Use LLM to help refine search strategy
-        llm_config = LLMConfig(
-            model_name="gpt-3.5-turbo",  # Default model
-            temperature=0.3
-        )
-        
-        search_strategy_prompt = f"""
-        You are a research assistant. Given the query: "{query}"
-        
-        1. Break down the search into key topics
-        2. Suggest refined search terms
-        3. Identify what types of sources would be most valuable
-        
-        Respond with a structured search plan.
-        """
+        self.update_memory("last_search_query", query)
         
         try:
             search_plan = await self.llm_provider.generate_response(
-                [{"role": "user", "content": search_strategy_prompt}],
-                llm_config
+                [
+                    _MSG_RESEARCH,
+                    {"role": "user", "content": f'Query: "{query}"'}
+                ],
+                self._cfg_search
             )
             
             # Simulate web search results
@@ -74,7 +147,7 @@ class ResearchAgent(BaseAgent):
             Note: This is a simulation. In production, integrate with actual search APIs.
             """
             
-            await self.update_memory("last_search_results", search_results)
+            self.update_memory("last_search_results", search_results)
             return search_results
             
         except Exception as e:
@@ -82,32 +155,18 @@ class ResearchAgent(BaseAgent):
     
     async def _analyze_data(self, data_description: str) -> str:
         """Analyze data and provide insights"""
-        await self.update_memory("last_analysis_request", data_description)
-        
-        llm_config = LLMConfig(
-            model_name="gpt-4",  # Use more capable model for analysis
-            temperature=0.2
-        )
-        
-        analysis_prompt = f"""
-        You are a data analyst. Analyze the following data description: "{data_description}"
-        
-        Provide:
-        1. Key patterns and trends
-        2. Statistical insights
-        3. Actionable recommendations
-        4. Potential limitations or caveats
-        
-        Structure your analysis professionally.
-        """
+        self.update_memory("last_analysis_request", data_description)
         
         try:
             analysis = await self.llm_provider.generate_response(
-                [{"role": "user", "content": analysis_prompt}],
-                llm_config
+                [
+                    _MSG_ANALYSIS,
+                    {"role": "user", "content": f'Data description: "{data_description}"'}
+                ],
+                self._cfg_analysis
             )
             
-            await self.update_memory("last_analysis", analysis)
+            self.update_memory("last_analysis", analysis)
             return analysis
             
         except Exception as e:
@@ -118,40 +177,23 @@ class ResearchAgent(BaseAgent):
         topic = task.get("message", "General Research Topic")
         context = task.get("context", {})
         
-        await self.update_memory("current_report_topic", topic)
+        self.update_memory("current_report_topic", topic)
         
         # First, gather information
         search_results = await self._perform_web_search(topic)
         
-        # Then analyze and synthesize
-        llm_config = LLMConfig(
-            model_name="gpt-4",
-            temperature=0.4
-        )
-        
-        report_prompt = f"""
-        Generate a comprehensive research report on: "{topic}"
-        
-        Based on these search results: {search_results}
-        
-        Structure the report with:
-        1. Executive Summary
-        2. Background and Context
-        3. Key Findings
-        4. Analysis and Insights
-        5. Recommendations
-        6. Conclusion
-        
-        Make it professional and well-researched.
-        """
-        
         try:
             report = await self.llm_provider.generate_response(
-                [{"role": "user", "content": report_prompt}],
-                llm_config
+                [
+                    _MSG_REPORT,
+                    {"role": "user", "content": "".join(
+                        (_REPORT_USER_HEAD, topic, _REPORT_USER_MID, search_results)
+                    )}
+                ],
+                self._cfg_report
             )
             
-            await self.update_memory("last_report", report)
+            self.update_memory("last_report", report)
             return report
             
         except Exception as e:
@@ -161,27 +203,58 @@ class ResearchAgent(BaseAgent):
         """Handle general research requests"""
         message = task.get("message", "")
         
-        # Determine the best research approach
-        if "search" in message.lower() or "find" in message.lower():
+        # Determine the best research approach with a single keyword
+        # scan; the earliest keyword in the message decides
+        match = _KEYWORD_RE.search(message)
+        keyword = match.group(0).lower() if match else None
+        if keyword in ("search", "find"):
             return await self._perform_web_search(message)
-        elif "analyze" in message.lower() or "examine" in message.lower():
+        elif keyword in ("analyze", "examine"):
             return await self._analyze_data(message)
         else:
-            # Default to comprehensive research
-            search_result = await self._perform_web_search(message)
-            analysis = await self._analyze_data(f"Research findings: {search_result}")
-            
+            # Default to comprehensive research, fused into one round-trip
+            return await self._search_and_analyze(message)
+
+    async def _search_and_analyze(self, message: str) -> str:
+        """Run the search plan and analysis as a single LLM round-trip"""
+        self.update_memory("last_search_query", message)
+
+        try:
+            response = await self.llm_provider.generate_response(
+                [
+                    _MSG_COMBINED,
+                    {"role": "user", "content": f'Request: "{message}"'}
+                ],
+                self._cfg_combined
+            )
+
+            try:
+                parsed = json.loads(response)
+                search_result = parsed.get("search", "")
+                analysis = parsed.get("analysis", "")
+            except (json.JSONDecodeError, AttributeError):
+                # Model ignored the JSON contract; surface the raw text
+                search_result, analysis = response, ""
+
+            self.update_memory_bulk({
+                "last_search_results": search_result,
+                "last_analysis": analysis
+            })
+
             return f"Research Results:\n{search_result}\n\nAnalysis:\n{analysis}"
+
+        except Exception as e:
+            return f"Error performing research: {str(e)}"
     
     async def get_research_history(self) -> Dict[str, Any]:
         """Get history of research activities"""
-        return {
-            "last_search_query": await self.get_memory("last_search_query"),
-            "last_search_results": await self.get_memory("last_search_results"), 
-            "last_analysis": await self.get_memory("last_analysis"),
-            "last_report": await self.get_memory("last_report"),
-            "current_report_topic": await self.get_memory("current_report_topic")
-        }
+        return self.get_memory_many([
+            "last_search_query",
+            "last_search_results",
+            "last_analysis",
+            "last_report",
+            "current_report_topic"
+        ])
     
     async def export_research_data(self) -> str:
         """Export research data for external use"""
@@ -193,7 +266,7 @@ class ResearchAgent(BaseAgent):
         
         Recent Search Query: {history.get('last_search_query', 'N/A')}
         
-        Last Analysis Request: {await self.get_memory('last_analysis_request')}
+        Last Analysis Request: {self.get_memory('last_analysis_request')}
         
         Current Report Topic: {history.get('current_report_topic', 'N/A')}
         
@@ -1,5 +1,5 @@
-from .base import BaseLLMProvider, LLMConfig
-from typing import Dict, List, Optional
+from .base import BaseLLMProvider, LLMConfig, get_shared_http_client
+from typing import AsyncIterator, Dict, List, Optional
 import os
 try:
     import anthropic
@@ -35,24 +35,85 @@ class AnthropicProvider(BaseLLMProvider):
                     "Anthropic API key not found. Please set ANTHROPIC_API_KEY environment variable."
                 )
             
-            self.client = anthropic.AsyncAnthropic(api_key=api_key)
+            http_client = get_shared_http_client()
+            if http_client is not None:
+                self.client = anthropic.AsyncAnthropic(api_key=api_key, http_client=http_client)
+            else:
+                self.client = anthropic.AsyncAnthropic(api_key=api_key)
     
     async def generate_response(self, messages: List[Dict], config: LLMConfig) -> str:
         """Generate response using Anthropic API"""
         self._initialize_client()
         
+        cache_key = None
+        if self._should_cache(config):
+            cache_key = self._cache_key(messages, config)
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            if self.semantic_cache is not None:
+                model = config.model_name or self.get_default_model()
+                near = await self.semantic_cache.get(messages, model)
+                if near is not None:
+                    return near
+        
         try:
             # Convert OpenAI format to Anthropic format
             anthropic_messages = self._convert_messages(messages)
             
+            extra = dict(config.additional_params or {})
+            # Framework-level flag, not an API parameter
+            extra.pop("cacheable", None)
+            # OpenAI-only JSON-mode knob; Anthropic's API rejects it, so
+            # configs shared across providers must not leak it through
+            extra.pop("response_format", None)
+            if config.prompt_cache_key is not None:
+                # Anthropic has no routing key; mark the system block as
+                # cacheable instead so the shared prefix is reused
+                system_blocks = self._cacheable_system(messages)
+                if system_blocks is not None:
+                    extra.setdefault("system", system_blocks)
             response = await self.client.messages.create(
                 model=config.model_name or self.get_default_model(),
                 max_tokens=config.max_tokens,
                 temperature=config.temperature,
                 messages=anthropic_messages,
-                **(config.additional_params or {})
+                **extra
             )
-            return response.content[0].text
+            text = response.content[0].text
+            if cache_key is not None:
+                await self.response_cache.set(cache_key, text)
+                if self.semantic_cache is not None:
+                    await self.semantic_cache.set(
+                        messages, config.model_name or self.get_default_model(), text
+                    )
+            return text
+        except Exception as e:
+            raise Exception(f"Anthropic API error: {str(e)}")
+    
+    async def generate_response_stream(self, messages: List[Dict],
+                                       config: LLMConfig) -> AsyncIterator[str]:
+        """Stream response text as Anthropic produces it"""
+        self._initialize_client()
+        
+        try:
+            anthropic_messages = self._convert_messages(messages)
+            extra = dict(config.additional_params or {})
+            extra.pop("cacheable", None)
+            extra.pop("response_format", None)
+            if config.prompt_cache_key is not None:
+                system_blocks = self._cacheable_system(messages)
+                if system_blocks is not None:
+                    extra.setdefault("system", system_blocks)
+            async with self.client.messages.stream(
+                model=config.model_name or self.get_default_model(),
+                max_tokens=config.max_tokens,
+                temperature=config.temperature,
+                messages=anthropic_messages,
+                **extra
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
         except Exception as e:
             raise Exception(f"Anthropic API error: {str(e)}")
     
@@ -71,7 +132,8 @@ class AnthropicProvider(BaseLLMProvider):
                 temperature=config.temperature,
                 messages=anthropic_messages,
                 tools=anthropic_tools,
-                **(config.additional_params or {})
+                **{k: v for k, v in (config.additional_params or {}).items()
+                   if k not in ("cacheable", "response_format")}
             )
             
             return {
@@ -81,6 +143,19 @@ class AnthropicProvider(BaseLLMProvider):
         except Exception as e:
             raise Exception(f"Anthropic tool call error: {str(e)}")
     
+    def _cacheable_system(self, messages: List[Dict]) -> Optional[List[Dict]]:
+        """Build a cache_control-tagged system block from OpenAI-style messages"""
+        system_text = "\n\n".join(
+            msg["content"] for msg in messages if msg.get("role") == "system"
+        )
+        if not system_text:
+            return None
+        return [{
+            "type": "text",
+            "text": system_text,
+            "cache_control": {"type": "ephemeral"}
+        }]
+
     def _convert_messages(self, messages: List[Dict]) -> List[Dict]:
         """Convert OpenAI message format to Anthropic format"""
         anthropic_messages = []
@@ -1,26 +1,96 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Mapping, Optional
 from dataclasses import dataclass, field
+from types import MappingProxyType
 import os
+from .cache import LLMCache, make_cache_key
+from .semantic_cache import get_shared_semantic_cache
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
-@dataclass
+# One pooled HTTP client shared by every provider instance; sized so a
+# bursty agent fleet reuses warm connections instead of paying a TCP/TLS
+# handshake per request
+_shared_http_client = None
+
+def get_shared_http_client():
+    """Return the process-wide pooled httpx client, or None without httpx"""
+    global _shared_http_client
+    if httpx is None:
+        return None
+    if _shared_http_client is None:
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        try:
+            _shared_http_client = httpx.AsyncClient(limits=limits, http2=True)
+        except ImportError:
+            # http2 extra (h2) not installed; HTTP/1.1 still pools
+            _shared_http_client = httpx.AsyncClient(limits=limits)
+    return _shared_http_client
+
+# Shared empty default: configs are frozen and reused across calls, so
+# the default params mapping must be immutable
+_EMPTY_PARAMS: Mapping[str, Any] = MappingProxyType({})
+
+@dataclass(frozen=True, slots=True)
 class LLMConfig:
     model_name: str
     temperature: float = 0.7
     max_tokens: int = 2048
-    additional_params: Dict[str, Any] = field(default_factory=dict)
+    # Excluded from the hash (mappings aren't hashable) so configs can
+    # serve directly as dict keys; equality still compares it
+    additional_params: Mapping[str, Any] = field(default_factory=lambda: _EMPTY_PARAMS, hash=False)
+    # Routes requests that share a prompt prefix to the same cache shard;
+    # providers ignore it when unset
+    prompt_cache_key: Optional[str] = None
 
 class BaseLLMProvider(ABC):
     """Base class for all LLM providers"""
     
     def __init__(self):
         self.provider_name = self.__class__.__name__.replace("Provider", "").lower()
+        # Exact-match response cache; consulted only for requests that
+        # _should_cache deems deterministic enough to replay
+        self.response_cache = LLMCache()
+
+    @property
+    def semantic_cache(self) -> Optional["SemanticCache"]:
+        """Process-wide embedding-based near-duplicate cache
+
+        Built lazily on first access and shared across every provider
+        instance, so constructing a provider (e.g. during factory
+        validation) never pays the SentenceTransformer load. None when
+        the optional faiss/sentence-transformers deps are not installed.
+        """
+        return get_shared_semantic_cache()
+
+    def _should_cache(self, config: LLMConfig) -> bool:
+        """Cache near-deterministic requests, or any marked cacheable"""
+        if config.temperature <= 0.01:
+            return True
+        return bool((config.additional_params or {}).get("cacheable"))
+
+    def _cache_key(self, messages: List[Dict], config: LLMConfig,
+                   tools: Optional[List[Dict]] = None) -> str:
+        """Build the cache key for one request against this provider"""
+        return make_cache_key(
+            config.model_name or self.get_default_model(),
+            messages,
+            config.temperature,
+            tools
+        )
     
     @abstractmethod
     async def generate_response(self, messages: List[Dict], config: LLMConfig) -> str:
         """Generate text response from the LLM"""
         pass
     
+    async def generate_response_stream(self, messages: List[Dict],
+                                       config: LLMConfig) -> AsyncIterator[str]:
+        """Yield the response incrementally; default is one final chunk"""
+        yield await self.generate_response(messages, config)
+    
     @abstractmethod
     async def tool_call(self, messages: List[Dict], tools: List[Dict], config: LLMConfig) -> Dict:
         """Perform tool calling with the LLM"""
@@ -0,0 +1,57 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+def make_cache_key(model: str, messages: list, temperature: float,
+                   tools: Optional[list] = None) -> str:
+    """Build a stable digest for one LLM request"""
+    payload = json.dumps({
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "tools": tools or []
+    }, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class LLMCache:
+    """In-process LRU + TTL cache for exact-match LLM responses"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        # key -> (expiry timestamp, response); ordered oldest-used first
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for key, or None on miss/expiry"""
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    async def set(self, key: str, value: Any):
+        """Store a response, evicting the least recently used on overflow"""
+        async with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def clear(self):
+        """Drop all cached responses and reset counters"""
+        async with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
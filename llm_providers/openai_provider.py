@@ -1,5 +1,5 @@
-from .base import BaseLLMProvider, LLMConfig
-from typing import Dict, List, Optional
+from .base import BaseLLMProvider, LLMConfig, get_shared_http_client
+from typing import AsyncIterator, Dict, List, Optional
 import os
 try:
     import openai
@@ -35,21 +35,81 @@ class OpenAIProvider(BaseLLMProvider):
                     "OpenAI API key not found. Please set OPENAI_API_KEY environment variable."
                 )
             
-            self.client = openai.AsyncOpenAI(api_key=api_key)
+            http_client = get_shared_http_client()
+            if http_client is not None:
+                self.client = openai.AsyncOpenAI(api_key=api_key, http_client=http_client)
+            else:
+                self.client = openai.AsyncOpenAI(api_key=api_key)
     
     async def generate_response(self, messages: List[Dict], config: LLMConfig) -> str:
         """Generate response using OpenAI API"""
         self._initialize_client()
         
+        cache_key = None
+        if self._should_cache(config):
+            cache_key = self._cache_key(messages, config)
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            if self.semantic_cache is not None:
+                model = config.model_name or self.get_default_model()
+                near = await self.semantic_cache.get(messages, model)
+                if near is not None:
+                    return near
+        
+        try:
+            extra = dict(config.additional_params or {})
+            # Framework-level flag, not an API parameter
+            extra.pop("cacheable", None)
+            if config.prompt_cache_key is not None:
+                # openai 1.93 predates the typed prompt_cache_key kwarg;
+                # extra_body reaches the API on every 1.x SDK
+                body = dict(extra.get("extra_body") or {})
+                body.setdefault("prompt_cache_key", config.prompt_cache_key)
+                extra["extra_body"] = body
+            response = await self.client.chat.completions.create(
+                model=config.model_name or self.get_default_model(),
+                messages=messages,
+                temperature=config.temperature,
+                max_tokens=config.max_tokens,
+                **extra
+            )
+            text = response.choices[0].message.content
+            if cache_key is not None:
+                await self.response_cache.set(cache_key, text)
+                if self.semantic_cache is not None:
+                    await self.semantic_cache.set(
+                        messages, config.model_name or self.get_default_model(), text
+                    )
+            return text
+        except Exception as e:
+            raise Exception(f"OpenAI API error: {str(e)}")
+    
+    async def generate_response_stream(self, messages: List[Dict],
+                                       config: LLMConfig) -> AsyncIterator[str]:
+        """Stream response tokens as OpenAI produces them"""
+        self._initialize_client()
+        
         try:
+            extra = dict(config.additional_params or {})
+            extra.pop("cacheable", None)
+            if config.prompt_cache_key is not None:
+                # openai 1.93 predates the typed prompt_cache_key kwarg;
+                # extra_body reaches the API on every 1.x SDK
+                body = dict(extra.get("extra_body") or {})
+                body.setdefault("prompt_cache_key", config.prompt_cache_key)
+                extra["extra_body"] = body
             response = await self.client.chat.completions.create(
                 model=config.model_name or self.get_default_model(),
                 messages=messages,
                 temperature=config.temperature,
                 max_tokens=config.max_tokens,
-                **(config.additional_params or {})
+                stream=True,
+                **extra
             )
-            return response.choices[0].message.content
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
         except Exception as e:
             raise Exception(f"OpenAI API error: {str(e)}")
     
@@ -58,13 +118,22 @@ class OpenAIProvider(BaseLLMProvider):
         self._initialize_client()
         
         try:
+            extra = dict(config.additional_params or {})
+            # Framework-level flag, not an API parameter
+            extra.pop("cacheable", None)
+            if config.prompt_cache_key is not None:
+                # openai 1.93 predates the typed prompt_cache_key kwarg;
+                # extra_body reaches the API on every 1.x SDK
+                body = dict(extra.get("extra_body") or {})
+                body.setdefault("prompt_cache_key", config.prompt_cache_key)
+                extra["extra_body"] = body
             response = await self.client.chat.completions.create(
                 model=config.model_name or self.get_default_model(),
                 messages=messages,
                 tools=tools,
                 temperature=config.temperature,
                 max_tokens=config.max_tokens,
-                **(config.additional_params or {})
+                **extra
             )
             
             return {
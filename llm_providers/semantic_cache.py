@@ -0,0 +1,122 @@
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import time
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import faiss
+except ImportError:
+    faiss = None
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+def create_semantic_cache(**kwargs) -> Optional["SemanticCache"]:
+    """Build a SemanticCache, or None when the optional deps are absent"""
+    if np is None or faiss is None or SentenceTransformer is None:
+        return None
+    return SemanticCache(**kwargs)
+
+# One cache (and so one SentenceTransformer load) for the whole process,
+# built on first use: provider __init__ stays cheap and throwaway
+# instances from factory validation never pay the model load
+_shared_cache: Optional["SemanticCache"] = None
+_shared_cache_built = False
+
+def get_shared_semantic_cache() -> Optional["SemanticCache"]:
+    """Return the process-wide cache, built lazily on first call"""
+    global _shared_cache, _shared_cache_built
+    if not _shared_cache_built:
+        _shared_cache = create_semantic_cache()
+        _shared_cache_built = True
+    return _shared_cache
+
+class SemanticCache:
+    """Nearest-neighbor response cache for near-duplicate prompts
+
+    Embeds the last user message and serves a cached response when the
+    best cosine match clears the similarity threshold, catching asks
+    that an exact-match cache misses ("search for AI developments" vs
+    "find recent AI news"). Entries are sharded per model name so a
+    gpt-4 request can never be answered from a gpt-3.5-turbo response.
+    """
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2",
+                 threshold: float = 0.92, ttl_seconds: float = 3600.0,
+                 max_entries: int = 1024):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._model = SentenceTransformer(model_name)
+        self._dimension = self._model.get_sentence_embedding_dimension()
+        # Per-LLM-model shards: model name -> (index, parallel entries);
+        # entries rows are (expiry timestamp, response)
+        self._shards: Dict[str, Tuple["faiss.Index", List[tuple]]] = {}
+        self._lock = asyncio.Lock()
+
+    def _shard(self, model: str) -> Tuple["faiss.Index", List[tuple]]:
+        """Get or create the index/entries pair for one LLM model"""
+        shard = self._shards.get(model)
+        if shard is None:
+            shard = (faiss.IndexFlatIP(self._dimension), [])
+            self._shards[model] = shard
+        return shard
+
+    @staticmethod
+    def _query_text(messages: List[Dict]) -> Optional[str]:
+        """Extract the last user message as the similarity key"""
+        for msg in reversed(messages):
+            if msg.get("role") == "user":
+                return msg.get("content")
+        return None
+
+    async def _embed(self, text: str):
+        """Encode off-loop; the model call is CPU-bound"""
+        vector = await asyncio.to_thread(
+            self._model.encode, [text], normalize_embeddings=True
+        )
+        return np.asarray(vector, dtype="float32")
+
+    async def get(self, messages: List[Dict], model: str) -> Optional[str]:
+        """Return the cached response for a near-duplicate query, if any"""
+        text = self._query_text(messages)
+        shard = self._shards.get(model)
+        if text is None or shard is None or not shard[1]:
+            self.misses += 1
+            return None
+
+        vector = await self._embed(text)
+        async with self._lock:
+            index, entries = shard
+            scores, ids = index.search(vector, 1)
+            score, idx = float(scores[0][0]), int(ids[0][0])
+            if idx < 0 or score < self.threshold:
+                self.misses += 1
+                return None
+            expiry, response = entries[idx]
+            if expiry < time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return response
+
+    async def set(self, messages: List[Dict], model: str, response: str):
+        """Store a response under the query's embedding"""
+        text = self._query_text(messages)
+        if text is None:
+            return
+
+        vector = await self._embed(text)
+        async with self._lock:
+            index, entries = self._shard(model)
+            if len(entries) >= self.max_entries:
+                # Flat index has no cheap deletion; start fresh
+                index.reset()
+                entries.clear()
+            index.add(vector)
+            entries.append((time.monotonic() + self.ttl_seconds, response))
@@ -1,5 +1,13 @@
 import asyncio
+import logging
+import logging.handlers
 import os
+import queue
+import signal
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 from typing import Optional
 from orchestration.conversation_manager import ConversationManager
 from orchestration.router import AgentRouter
@@ -14,6 +22,20 @@ from agents.planning_agent import PlanningAgent
 from tools.tool_manager import ToolManager
 from tools.implementations import get_default_tools
 
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route log records through a queue so formatting and IO happen off
+    the request path"""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    return listener
+
 async def setup_llm_providers() -> LLMProviderFactory:
     """Setup LLM providers with validation"""
     factory = LLMProviderFactory()
@@ -37,19 +59,16 @@ async def setup_llm_providers() -> LLMProviderFactory:
     print("✅ LLM provider factory initialized")
     return factory
 
-async def setup_mcp_integration() -> tuple[MCPServerManager, MCPClientManager]:
+async def setup_mcp_integration(default_tools: dict) -> tuple[MCPServerManager, MCPClientManager]:
     """Setup MCP server and client managers"""
     server_manager = MCPServerManager()
     client_manager = MCPClientManager()
     
-    # Register default tools with MCP server
-    default_tools = get_default_tools()
-    for tool_name, tool_config in default_tools.items():
-        await server_manager.register_tool(
-            tool_name,
-            tool_config["instance"],
-            tool_config["schema"]
-        )
+    # Register the shared default tools with MCP server in one pass
+    server_manager.register_tools_bulk({
+        tool_name: (tool_config["instance"], tool_config["schema"])
+        for tool_name, tool_config in default_tools.items()
+    })
     
     print("✅ MCP integration initialized")
     return server_manager, client_manager
@@ -64,12 +83,11 @@ async def setup_a2a_protocol() -> tuple[AgentRegistry, A2AClient]:
     print("✅ A2A protocol initialized")
     return registry, system_client
 
-async def setup_tools() -> ToolManager:
+async def setup_tools(default_tools: dict) -> ToolManager:
     """Setup tool manager with default tools"""
     tool_manager = ToolManager()
     
-    # Register default tools
-    default_tools = get_default_tools()
+    # Register the shared default tools
     for tool_name, tool_config in default_tools.items():
         tool_manager.register_tool(
             tool_name,
@@ -90,61 +108,49 @@ async def create_agents(llm_factory: LLMProviderFactory,
     research_client = A2AClient("research-001", registry)
     planning_client = A2AClient("planning-001", registry)
     
-    # Try to create research agent with OpenAI
-    try:
-        research_agent = ResearchAgent(
-            "research-001",
-            llm_factory.get_provider("openai"),
-            mcp_manager,
-            research_client
-        )
-        await research_agent.initialize()
-        agents["research"] = research_agent
-        print("✅ Research agent created with OpenAI provider")
-    except Exception as e:
-        print(f"⚠️  Could not initialize research agent with OpenAI: {e}")
-        
-        # Try fallback to Anthropic
+    async def _build_agent(label: str, agent_cls, agent_id: str,
+                           a2a_client: A2AClient, primary: str, fallback: str):
+        """Try the primary provider, then the fallback"""
         try:
-            research_agent = ResearchAgent(
-                "research-001",
-                llm_factory.get_provider("anthropic"),
+            agent = agent_cls(
+                agent_id,
+                llm_factory.get_provider(primary),
                 mcp_manager,
-                research_client
+                a2a_client
             )
-            await research_agent.initialize()
-            agents["research"] = research_agent
-            print("✅ Research agent created with Anthropic provider (fallback)")
-        except Exception as e2:
-            print(f"❌ Could not initialize research agent with any provider: {e2}")
-    
-    # Try to create planning agent with Anthropic
-    try:
-        planning_agent = PlanningAgent(
-            "planning-001", 
-            llm_factory.get_provider("anthropic"),
-            mcp_manager,
-            planning_client
-        )
-        await planning_agent.initialize()
-        agents["planning"] = planning_agent
-        print("✅ Planning agent created with Anthropic provider")
-    except Exception as e:
-        print(f"⚠️  Could not initialize planning agent with Anthropic: {e}")
+            await agent.initialize()
+            print(f"✅ {label.capitalize()} agent created with {primary.capitalize()} provider")
+            return agent
+        except Exception as e:
+            print(f"⚠️  Could not initialize {label} agent with {primary.capitalize()}: {e}")
         
-        # Try fallback to OpenAI
         try:
-            planning_agent = PlanningAgent(
-                "planning-001",
-                llm_factory.get_provider("openai"),
+            agent = agent_cls(
+                agent_id,
+                llm_factory.get_provider(fallback),
                 mcp_manager,
-                planning_client
+                a2a_client
             )
-            await planning_agent.initialize()
-            agents["planning"] = planning_agent
-            print("✅ Planning agent created with OpenAI provider (fallback)")
+            await agent.initialize()
+            print(f"✅ {label.capitalize()} agent created with {fallback.capitalize()} provider (fallback)")
+            return agent
         except Exception as e2:
-            print(f"❌ Could not initialize planning agent with any provider: {e2}")
+            print(f"❌ Could not initialize {label} agent with any provider: {e2}")
+            return None
+    
+    # Build both agents concurrently; startup costs max() of the two
+    # initializations instead of their sum
+    research_agent, planning_agent = await asyncio.gather(
+        _build_agent("research", ResearchAgent, "research-001",
+                     research_client, "openai", "anthropic"),
+        _build_agent("planning", PlanningAgent, "planning-001",
+                     planning_client, "anthropic", "openai")
+    )
+    
+    if research_agent is not None:
+        agents["research"] = research_agent
+    if planning_agent is not None:
+        agents["planning"] = planning_agent
     
     return agents
 
@@ -152,11 +158,20 @@ async def create_agentic_system():
     """Create and configure the complete agentic system"""
     print("🚀 Initializing Modular Agentic System...")
     
-    # Initialize core components
-    llm_factory = await setup_llm_providers()
-    mcp_manager, mcp_client = await setup_mcp_integration()
-    registry, system_a2a_client = await setup_a2a_protocol()
-    tool_manager = await setup_tools()
+    # Build the default tool set once and share it between both managers
+    default_tools = get_default_tools()
+    
+    # Initialize core components concurrently; the four setups are
+    # independent of each other
+    (llm_factory,
+     (mcp_manager, mcp_client),
+     (registry, system_a2a_client),
+     tool_manager) = await asyncio.gather(
+        setup_llm_providers(),
+        setup_mcp_integration(default_tools),
+        setup_a2a_protocol(),
+        setup_tools(default_tools)
+    )
     
     # Create specialized agents
     agents = await create_agents(llm_factory, mcp_manager, registry)
@@ -217,7 +232,12 @@ async def run_interactive_demo(conversation_manager: ConversationManager):
     
     while True:
         try:
-            user_input = input("👤 You: ").strip()
+            # Read stdin off-loop so background tasks keep running while
+            # the user types
+            user_input = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: input("👤 You: ")
+            )
+            user_input = user_input.strip()
             
             if user_input.lower() in ['quit', 'exit', 'bye']:
                 print("👋 Goodbye!")
@@ -264,6 +284,7 @@ async def run_system_tests(conversation_manager: ConversationManager, router: Ag
 
 async def main():
     """Main entry point"""
+    log_listener = setup_logging()
     try:
         # Create the system
         system_result = await create_agentic_system()
@@ -287,25 +308,43 @@ async def main():
             print("💡 Set TEST_MODE=true to run system tests")
             print("🔗 HTTP API endpoints would be available at http://localhost:8000")
             
-            # Keep the system running
+            # Keep the system running without polling: block on an Event
+            # that the signal handlers set
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            try:
+                loop.add_signal_handler(signal.SIGINT, stop.set)
+                loop.add_signal_handler(signal.SIGTERM, stop.set)
+            except NotImplementedError:
+                # Platforms without loop signal handlers (e.g. Windows)
+                # still deliver KeyboardInterrupt below
+                pass
+            
             print("\n⏸️  Press Ctrl+C to stop the system")
             try:
-                while True:
-                    await asyncio.sleep(1)
+                await stop.wait()
             except KeyboardInterrupt:
-                print("\n🛑 Shutting down system...")
-                
-                # Graceful shutdown
-                for agent in agents.values():
-                    await agent.shutdown()
-                
-                print("✅ System shutdown complete")
+                pass
+            
+            print("\n🛑 Shutting down system...")
+            
+            # Graceful shutdown
+            for agent in agents.values():
+                await agent.shutdown()
+            
+            print("✅ System shutdown complete")
     
     except Exception as e:
         print(f"❌ Failed to start system: {e}")
         return 1
+    finally:
+        log_listener.stop()
     
     return 0
 
 if __name__ == "__main__":
+    # libuv-backed loop is substantially faster on socket-heavy workloads;
+    # fall back to the stdlib loop where uvloop is unavailable (e.g. Windows)
+    if uvloop is not None:
+        uvloop.install()
     exit_code = asyncio.run(main()) 
\ No newline at end of file
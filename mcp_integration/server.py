@@ -1,9 +1,20 @@
-from typing import Any, Dict, Optional, Callable
+from typing import Any, Dict, Optional, Callable, Tuple
+import json
 try:
     from mcp import McpServer, StdioServerTransport
 except ImportError:
     McpServer = None
     StdioServerTransport = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _encode_schema(schema: Dict) -> bytes:
+    """Serialize a tool schema once at registration time"""
+    if orjson is not None:
+        return orjson.dumps(schema)
+    return json.dumps(schema, separators=(",", ":")).encode()
 
 class MCPServerManager:
     def __init__(self):
@@ -11,9 +22,23 @@ class MCPServerManager:
         self.tools = {}
         self.resources = {}
     
-    async def register_tool(self, name: str, func: Callable, schema: Dict):
+    def register_tool(self, name: str, func: Callable, schema: Dict):
         """Register a tool with MCP server"""
-        self.tools[name] = {"function": func, "schema": schema}
+        self.tools[name] = {
+            "function": func,
+            "schema": schema,
+            # Pre-encoded once so transports can ship the bytes directly
+            "schema_bytes": _encode_schema(schema)
+        }
+    
+    def register_tools_bulk(self, mapping: Dict[str, Tuple[Callable, Dict]]):
+        """Register many tools in one pass without touching the event loop"""
+        for name, (func, schema) in mapping.items():
+            self.tools[name] = {
+                "function": func,
+                "schema": schema,
+                "schema_bytes": _encode_schema(schema)
+            }
     
     async def register_resource(self, uri: str, provider: Callable):
         """Register a resource provider"""
@@ -0,0 +1,72 @@
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+import asyncio
+
+class RequestBatcher:
+    """Coalesce concurrent requests into bounded parallel batches
+
+    Requests arriving within the wait window are collected and executed
+    together with a shared concurrency cap, so a burst of users neither
+    serializes into back-to-back calls nor thrashes provider rate limits.
+    """
+
+    def __init__(self, handler: Callable[[Any], Awaitable[Any]],
+                 max_batch: int = 16, max_wait_ms: float = 5.0,
+                 max_concurrency: int = 16):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Started lazily on first submit so construction needs no loop
+        self._flusher: Optional[asyncio.Task] = None
+        # Strong references to in-flight request tasks so the loop
+        # doesn't garbage-collect them mid-execution
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Enqueue one request and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        return await future
+
+    async def _flush_loop(self):
+        """Drain the queue in batches until no work is pending"""
+        while not self._queue.empty():
+            batch = await self._collect_batch()
+            # Launch execution in the background and go straight back to
+            # collecting: one slow handler must not head-of-line-block
+            # requests arriving in later windows (the semaphore already
+            # bounds total concurrency)
+            for item, future in batch:
+                task = asyncio.create_task(self._run_one(item, future))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+
+    async def _collect_batch(self) -> List[Tuple[Any, asyncio.Future]]:
+        """Gather up to max_batch requests within the wait window"""
+        batch = [self._queue.get_nowait()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run_one(self, item: Any, future: asyncio.Future):
+        """Execute one request under the shared concurrency cap"""
+        async with self._semaphore:
+            try:
+                result = await self.handler(item)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
@@ -1,15 +1,90 @@
 from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
 from .router import AgentRouter
+from .batcher import RequestBatcher
+from .state_store import ConversationStore
 import asyncio
-from datetime import datetime
+import heapq
+import logging
+import re
+import time
+from collections import deque
+from itertools import islice
+from datetime import datetime, timezone
 import json
+import sys
+
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True)
+class Msg:
+    """One logged conversation message; slotted to avoid per-message
+    dict overhead at history scale. The timestamp is epoch nanoseconds;
+    ISO formatting happens lazily on the output path only"""
+    role: str
+    content: str
+    ts: int
 
 class ConversationManager:
-    def __init__(self, router: AgentRouter):
+    # Keyword routing table. Note: classification is leftmost-keyword —
+    # the category of the earliest keyword in the message wins, not the
+    # table order (the compiled alternation below scans once and stops
+    # at the first match)
+    _TASK_KEYWORDS = (
+        ("research", frozenset(("search", "find", "research", "look up")),
+         ["web_search", "data_analysis"]),
+        ("planning", frozenset(("plan", "schedule", "organize", "break down")),
+         ["task_decomposition", "workflow_planning"]),
+        ("analysis", frozenset(("analyze", "report", "summarize")),
+         ["data_analysis", "report_generation"]),
+        ("coding", frozenset(("code", "program", "implement", "develop")),
+         ["code_generation", "debugging"]),
+    )
+
+    # One compiled alternation built from the table: the whole message is
+    # scanned once in C and the named group identifies the task type
+    _TASK_RE = re.compile("|".join(
+        "(?P<%s>\\b(?:%s))" % (task_type, "|".join(
+            re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)
+        ))
+        for task_type, keywords, _ in _TASK_KEYWORDS
+    ), re.IGNORECASE)
+
+    _TASK_CAPS = {task_type: caps for task_type, _, caps in _TASK_KEYWORDS}
+
+    # Sliding window of messages kept in memory per user; older turns
+    # fall off instead of growing the history without bound
+    MAX_HISTORY = 200
+
+    # Last-activity writes are quantized: the cleanup threshold is hours,
+    # so refreshing more than once per minute is pure churn
+    ACTIVITY_RESOLUTION = 60.0
+
+    def __init__(self, router: AgentRouter, store: Optional[ConversationStore] = None):
         self.router = router
+        # Optional shared backend (e.g. Redis) mirroring recent history
+        # and the active flag so multiple workers can serve one user
+        self.store = store
         self.conversation_state: Dict[str, Dict] = {}
-        self.conversation_history: Dict[str, List[Dict]] = {}
+        self.conversation_history: Dict[str, deque] = {}
         self.active_sessions: Dict[str, bool] = {}
+        # Concurrent user requests are coalesced and routed as a bounded
+        # parallel batch instead of independent back-to-back calls
+        self._batcher = RequestBatcher(self.router.route_task)
+        # Log entries are queued and applied by a background writer in
+        # batches; both are created lazily on the first logged message
+        self._log_queue: Optional[asyncio.Queue] = None
+        self._log_writer_task: Optional[asyncio.Task] = None
+        # Running counters so stats reads stay O(1) under polling
+        self._total_messages = 0
+        self._active_count = 0
+        # Per-user task-dict templates copied per turn by
+        # _analyze_user_message
+        self._task_template: Dict[str, Dict] = {}
+        # Min-heap of (activity ts, user_id) with lazy deletion: stale
+        # entries are skipped at pop time, so cleanup touches only the
+        # oldest sessions instead of sweeping every user
+        self._activity_heap: List[tuple] = []
     
     async def process_user_input(self, user_id: str, message: str) -> str:
         """Process user input and coordinate agent responses"""
@@ -18,100 +93,177 @@ class ConversationManager:
         if user_id not in self.conversation_state:
             await self._initialize_conversation(user_id)
         
-        # Log the message
-        await self._log_message(user_id, "user", message)
+        # Log the message; enqueueing is synchronous so this costs no
+        # event-loop hop on the request path
+        self._log_message(user_id, "user", message)
         
         # Analyze the message to determine task type and requirements
         task = await self._analyze_user_message(user_id, message)
         
-        # Route to appropriate agent
-        response = await self.router.route_task(task)
+        # Route to appropriate agent, batched with any concurrent requests
+        response = await self._batcher.submit(task)
         
         # Log the response
-        await self._log_message(user_id, "assistant", response)
+        self._log_message(user_id, "assistant", response)
         
         return response
     
     async def _initialize_conversation(self, user_id: str):
         """Initialize conversation state for new user"""
+        now_iso = datetime.now().isoformat()
         self.conversation_state[user_id] = {
-            "started_at": datetime.now().isoformat(),
+            "started_at": now_iso,
             "context": {},
             "preferences": {},
-            "last_activity": datetime.now().isoformat()
+            "last_activity": now_iso,
+            # Epoch copy so staleness checks compare floats without
+            # parsing the ISO string back
+            "last_activity_ts": time.time()
         }
-        self.conversation_history[user_id] = []
+        heapq.heappush(
+            self._activity_heap,
+            (self.conversation_state[user_id]["last_activity_ts"], user_id)
+        )
+        self.conversation_history[user_id] = deque(maxlen=self.MAX_HISTORY)
         self.active_sessions[user_id] = True
-        print(f"Initialized conversation for user: {user_id}")
+        self._active_count += 1
+        if self.store is not None:
+            await self.store.set_active(user_id, True)
+        logger.info("Initialized conversation for user: %s", user_id)
     
-    async def _log_message(self, user_id: str, role: str, content: str):
-        """Log message to conversation history"""
-        if user_id not in self.conversation_history:
-            self.conversation_history[user_id] = []
-        
-        message = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat()
-        }
+    def _log_message(self, user_id: str, role: str, content: str):
+        """Queue a message for the background log writer"""
+        if self._log_queue is None:
+            self._log_queue = asyncio.Queue()
+        # Roles come from a tiny fixed vocabulary; interning shares them
+        self._log_queue.put_nowait((user_id, sys.intern(role), content, time.time_ns()))
+        if self._log_writer_task is None or self._log_writer_task.done():
+            self._log_writer_task = asyncio.create_task(self._log_writer())
+    
+    async def _log_writer(self):
+        """Apply queued log entries, draining bursts in one batch"""
+        while True:
+            entry = await self._log_queue.get()
+            self._apply_log_entry(*entry)
+            self._drain_pending_logs()
+    
+    def _drain_pending_logs(self):
+        """Synchronously apply everything currently queued"""
+        if self._log_queue is None:
+            return
+        while True:
+            try:
+                entry = self._log_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self._apply_log_entry(*entry)
+    
+    def _apply_log_entry(self, user_id: str, role: str, content: str, ts: int):
+        """Append one entry to history and refresh activity state"""
+        history = self.conversation_history.get(user_id)
+        if history is None:
+            history = self.conversation_history[user_id] = deque(maxlen=self.MAX_HISTORY)
         
-        self.conversation_history[user_id].append(message)
+        # A full window evicts its oldest entry, so the count only grows
+        # while the window is filling
+        if len(history) < self.MAX_HISTORY:
+            self._total_messages += 1
         
-        # Update last activity
-        if user_id in self.conversation_state:
-            self.conversation_state[user_id]["last_activity"] = datetime.now().isoformat()
+        history.append(Msg(role, content, ts))
+        
+        if self.store is not None:
+            asyncio.ensure_future(self.store.append(
+                user_id, {"role": role, "content": content, "ts": ts}
+            ))
+        
+        # Update last activity, at most once per resolution window; the
+        # ISO string is only formatted when the window actually advances.
+        # Activity state stays in epoch seconds, so convert once here.
+        ts_seconds = ts / 1e9
+        state = self.conversation_state.get(user_id)
+        if state is not None and ts_seconds - state["last_activity_ts"] > self.ACTIVITY_RESOLUTION:
+            state["last_activity"] = datetime.fromtimestamp(ts_seconds).isoformat()
+            state["last_activity_ts"] = ts_seconds
+            # The old heap entry goes stale and is skipped at pop time
+            heapq.heappush(self._activity_heap, (ts_seconds, user_id))
     
     async def _analyze_user_message(self, user_id: str, message: str) -> Dict:
         """Analyze user message to determine task requirements"""
         
-        # Simple keyword-based analysis (in production, use LLM for this)
-        task_type = "general"
-        capabilities = []
-        
-        message_lower = message.lower()
-        
-        # Determine task type based on keywords
-        if any(keyword in message_lower for keyword in ["search", "find", "research", "look up"]):
-            task_type = "research"
-            capabilities = ["web_search", "data_analysis"]
-        elif any(keyword in message_lower for keyword in ["plan", "schedule", "organize", "break down"]):
-            task_type = "planning"
-            capabilities = ["task_decomposition", "workflow_planning"]
-        elif any(keyword in message_lower for keyword in ["analyze", "report", "summarize"]):
-            task_type = "analysis"
-            capabilities = ["data_analysis", "report_generation"]
-        elif any(keyword in message_lower for keyword in ["code", "program", "implement", "develop"]):
-            task_type = "coding"
-            capabilities = ["code_generation", "debugging"]
+        # History reads must observe everything logged so far
+        self._drain_pending_logs()
+        
+        # Simple keyword-based analysis (in production, use LLM for this):
+        # a single pass of the compiled alternation replaces per-category
+        # token scans; the earliest keyword in the message decides the
+        # category
+        match = self._TASK_RE.search(message)
+        if match:
+            task_type = match.lastgroup
+            capabilities = self._TASK_CAPS[task_type]
+        else:
+            task_type = "general"
+            capabilities = []
         
         # Get conversation context
         context = self.conversation_state.get(user_id, {}).get("context", {})
-        history = self.conversation_history.get(user_id, [])[-5:]  # Last 5 messages
-        
-        task = {
-            "type": task_type,
-            "message": message,
-            "user_id": user_id,
-            "capabilities": capabilities,
-            "context": context,
-            "conversation_history": history,
-            "timestamp": datetime.now().isoformat()
-        }
+        hist = self.conversation_history.get(user_id, ())
+        history = list(islice(hist, max(0, len(hist) - 5), None))  # Last 5 messages
+        
+        # Cache-friendly layout: stable fields first, committed history
+        # next, mutable context and the fresh message last. The prefix id
+        # only changes when a turn is committed, so downstream prompt
+        # builders can use it as a provider cache key for the shared
+        # prefix. Built once per user and copied, mutating only the
+        # per-turn fields.
+        template = self._task_template.get(user_id)
+        if template is None:
+            template = self._task_template[user_id] = {
+                "type": "general",
+                "user_id": user_id,
+                "capabilities": [],
+                "stable_prefix_id": "",
+                "conversation_history": [],
+                "context": {},
+                "message": "",
+                "timestamp": ""
+            }
+        
+        task = template.copy()
+        task["type"] = task_type
+        task["capabilities"] = capabilities
+        task["stable_prefix_id"] = f"{user_id}:{len(hist)}"
+        task["conversation_history"] = history
+        task["context"] = context
+        task["message"] = message
+        task["timestamp"] = datetime.now().isoformat()
         
         return task
     
     async def get_conversation_history(self, user_id: str, limit: Optional[int] = None) -> List[Dict]:
         """Get conversation history for user"""
-        history = self.conversation_history.get(user_id, [])
+        self._drain_pending_logs()
+        history = self.conversation_history.get(user_id, ())
         if limit:
-            return history[-limit:]
-        return history
+            history = islice(history, max(0, len(history) - limit), None)
+        # ISO timestamps are rendered only here, on the outbound path;
+        # internal consumers read the raw nanosecond ints
+        return [
+            {
+                "role": m.role,
+                "content": m.content,
+                "timestamp": datetime.fromtimestamp(
+                    m.ts / 1e9, tz=timezone.utc
+                ).isoformat()
+            }
+            for m in history
+        ]
     
     async def update_conversation_context(self, user_id: str, context_updates: Dict):
         """Update conversation context for user"""
         if user_id in self.conversation_state:
             self.conversation_state[user_id]["context"].update(context_updates)
-            print(f"Updated context for user {user_id}: {context_updates}")
+            logger.info("Updated context for user %s: %s", user_id, context_updates)
     
     async def set_user_preferences(self, user_id: str, preferences: Dict):
         """Set user preferences"""
@@ -119,48 +271,60 @@ class ConversationManager:
             await self._initialize_conversation(user_id)
         
         self.conversation_state[user_id]["preferences"] = preferences
-        print(f"Set preferences for user {user_id}: {preferences}")
+        logger.info("Set preferences for user %s: %s", user_id, preferences)
     
     async def end_conversation(self, user_id: str):
         """End conversation for user"""
-        if user_id in self.active_sessions:
+        if self.active_sessions.get(user_id):
             self.active_sessions[user_id] = False
-            print(f"Ended conversation for user: {user_id}")
+            self._active_count -= 1
+            if self.store is not None:
+                await self.store.set_active(user_id, False)
+            logger.info("Ended conversation for user: %s", user_id)
     
     async def cleanup_inactive_conversations(self, hours: int = 24):
         """Cleanup conversations inactive for specified hours"""
-        cutoff_time = datetime.now().timestamp() - (hours * 3600)
-        
-        inactive_users = []
-        for user_id, state in self.conversation_state.items():
-            last_activity = datetime.fromisoformat(state["last_activity"])
-            if last_activity.timestamp() < cutoff_time:
-                inactive_users.append(user_id)
+        cutoff_time = time.time() - (hours * 3600)
         
-        for user_id in inactive_users:
+        # Pop from the front of the activity heap until entries are fresh
+        # enough; stale duplicates (the user was active since the entry
+        # was pushed) are discarded
+        processed = 0
+        while self._activity_heap and self._activity_heap[0][0] < cutoff_time:
+            entry_ts, user_id = heapq.heappop(self._activity_heap)
+            state = self.conversation_state.get(user_id)
+            if state is None or state["last_activity_ts"] > entry_ts:
+                continue
             await self._cleanup_user_data(user_id)
-            print(f"Cleaned up inactive conversation for user: {user_id}")
+            logger.info("Cleaned up inactive conversation for user: %s", user_id)
+            processed += 1
+            if processed % 100 == 0:
+                # Yield periodically so a large sweep never blocks the loop
+                await asyncio.sleep(0)
     
     async def _cleanup_user_data(self, user_id: str):
         """Clean up data for a specific user"""
         if user_id in self.conversation_state:
             del self.conversation_state[user_id]
+        self._task_template.pop(user_id, None)
         if user_id in self.conversation_history:
-            del self.conversation_history[user_id]
-        if user_id in self.active_sessions:
-            del self.active_sessions[user_id]
+            self._total_messages -= len(self.conversation_history.pop(user_id))
+        if self.active_sessions.pop(user_id, False):
+            self._active_count -= 1
+        if self.store is not None:
+            await self.store.drop(user_id)
     
     async def get_system_stats(self) -> Dict[str, Any]:
         """Get system statistics"""
-        total_conversations = len(self.conversation_state)
-        active_conversations = sum(1 for active in self.active_sessions.values() if active)
-        total_messages = sum(len(history) for history in self.conversation_history.values())
+        self._drain_pending_logs()
+        # Fetch router status while the local counters compute
+        router_status_task = asyncio.ensure_future(self.router.get_agent_status())
         
         return {
-            "total_conversations": total_conversations,
-            "active_conversations": active_conversations,
-            "total_messages": total_messages,
-            "router_status": await self.router.get_agent_status()
+            "total_conversations": len(self.conversation_state),
+            "active_conversations": self._active_count,
+            "total_messages": self._total_messages,
+            "router_status": await router_status_task
         }
     
     async def start_multi_agent_conversation(self, user_id: str, agents: List[str], topic: str) -> str:
@@ -1,8 +1,14 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
+from collections import defaultdict
+import time
+import asyncio
+import logging
 from llm_providers.factory import LLMProviderFactory
 from mcp_integration.server import MCPServerManager
 from a2a_protocol.communication import A2AClient
 
+logger = logging.getLogger(__name__)
+
 class AgentRouter:
     def __init__(self, llm_manager: LLMProviderFactory, mcp_manager: MCPServerManager, a2a_client: A2AClient):
         self.llm_manager = llm_manager
@@ -10,7 +16,18 @@ class AgentRouter:
         self.a2a_client = a2a_client
         self.agents: Dict[str, Any] = {}
         self.routing_rules: Dict[str, List[str]] = {}
+        # Inverted index: capability -> agent ids, so selection is a set
+        # intersection instead of a scan over every agent
+        self._cap_index: Dict[str, Set[str]] = defaultdict(set)
+        # Frozen capability sets, built once per agent at registration
+        self._agent_caps: Dict[str, frozenset] = {}
+        # capability -> (fetch time, cards); discovery results are reused
+        # for DISCOVERY_TTL seconds instead of re-queried per task
+        self._disc_cache: Dict[str, tuple] = {}
     
+    # Seconds an external discovery result stays fresh
+    DISCOVERY_TTL = 30.0
+
     async def route_task(self, task: Dict) -> str:
         """Route task to appropriate agent based on capabilities"""
         task_type = task.get("type", "general")
@@ -36,31 +53,49 @@ class AgentRouter:
         if task_type in self.routing_rules:
             for agent_id in self.routing_rules[task_type]:
                 if agent_id in self.agents:
-                    agent = self.agents[agent_id]
-                    if self._agent_has_capabilities(agent, required_capabilities):
+                    if self._agent_has_capabilities(agent_id, required_capabilities):
                         return agent_id
         
-        # Fallback: find any agent with required capabilities
-        for agent_id, agent in self.agents.items():
-            if self._agent_has_capabilities(agent, required_capabilities):
-                return agent_id
+        # Fallback: intersect the capability posting lists
+        if required_capabilities:
+            candidates: Optional[Set[str]] = None
+            for capability in required_capabilities:
+                ids = self._cap_index.get(capability)
+                if not ids:
+                    candidates = set()
+                    break
+                candidates = set(ids) if candidates is None else candidates & ids
+            if candidates:
+                return next(iter(candidates))
+        elif self.agents:
+            return next(iter(self.agents))
         
         # Use A2A protocol to discover external agents
         if required_capabilities:
             for capability in required_capabilities:
-                external_agents = await self.a2a_client.registry.discover_agents(capability)
+                external_agents = self._discover_cached(capability)
                 if external_agents:
                     return external_agents[0].agent_id
         
         return None
     
-    def _agent_has_capabilities(self, agent: Any, required_capabilities: List[str]) -> bool:
-        """Check if agent has required capabilities"""
+    def _discover_cached(self, capability: str) -> List[Any]:
+        """Discover external agents, reusing results within the TTL"""
+        cached = self._disc_cache.get(capability)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self.DISCOVERY_TTL:
+            return cached[1]
+        
+        external_agents = self.a2a_client.registry.discover_agents(capability)
+        self._disc_cache[capability] = (now, external_agents)
+        return external_agents
+    
+    def _agent_has_capabilities(self, agent_id: str, required_capabilities: List[str]) -> bool:
+        """Check if a registered agent has the required capabilities"""
         if not required_capabilities:
             return True
         
-        agent_capabilities = getattr(agent, 'capabilities', [])
-        return all(cap in agent_capabilities for cap in required_capabilities)
+        return self._agent_caps.get(agent_id, frozenset()).issuperset(required_capabilities)
     
     async def _execute_task_with_agent(self, agent_id: str, task: Dict) -> str:
         """Execute task with selected agent"""
@@ -77,36 +112,51 @@ class AgentRouter:
     def register_agent(self, agent_id: str, agent: Any):
         """Register an agent with the router"""
         self.agents[agent_id] = agent
-        print(f"Registered agent: {agent_id}")
+        capabilities = frozenset(getattr(agent, 'capabilities', ()))
+        self._agent_caps[agent_id] = capabilities
+        for capability in capabilities:
+            self._cap_index[capability].add(agent_id)
+        logger.info("Registered agent: %s", agent_id)
     
     def unregister_agent(self, agent_id: str):
         """Unregister an agent from the router"""
         if agent_id in self.agents:
-            del self.agents[agent_id]
-            print(f"Unregistered agent: {agent_id}")
+            self.agents.pop(agent_id)
+            for capability in self._agent_caps.pop(agent_id, ()):
+                self._cap_index[capability].discard(agent_id)
+            logger.info("Unregistered agent: %s", agent_id)
     
     def add_routing_rule(self, task_type: str, agent_ids: List[str]):
         """Add routing rule for specific task type"""
         self.routing_rules[task_type] = agent_ids
-        print(f"Added routing rule: {task_type} -> {agent_ids}")
+        logger.info("Added routing rule: %s -> %s", task_type, agent_ids)
     
     def remove_routing_rule(self, task_type: str):
         """Remove routing rule for task type"""
         if task_type in self.routing_rules:
             del self.routing_rules[task_type]
-            print(f"Removed routing rule for: {task_type}")
+            logger.info("Removed routing rule for: %s", task_type)
     
     async def get_agent_status(self) -> Dict[str, Any]:
-        """Get status of all registered agents"""
-        status = {}
-        for agent_id, agent in self.agents.items():
-            try:
-                agent_status = getattr(agent, 'get_status', lambda: {"status": "unknown"})()
-                status[agent_id] = agent_status
-            except Exception as e:
-                status[agent_id] = {"status": "error", "error": str(e)}
+        """Get status of all registered agents concurrently"""
+        agent_ids = list(self.agents)
+        results = await asyncio.gather(
+            *(self._safe_status(self.agents[agent_id]) for agent_id in agent_ids),
+            return_exceptions=True
+        )
         
-        return status
+        return {
+            agent_id: ({"status": "error", "error": str(result)}
+                       if isinstance(result, Exception) else result)
+            for agent_id, result in zip(agent_ids, results)
+        }
+    
+    async def _safe_status(self, agent: Any) -> Dict[str, Any]:
+        """Fetch one agent's status, awaiting if it is a coroutine"""
+        agent_status = getattr(agent, 'get_status', lambda: {"status": "unknown"})()
+        if asyncio.iscoroutine(agent_status):
+            agent_status = await agent_status
+        return agent_status
     
     async def list_capabilities(self) -> Dict[str, List[str]]:
         """List capabilities of all registered agents"""
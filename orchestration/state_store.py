@@ -0,0 +1,119 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+from collections import defaultdict, deque
+import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+def _dumps(message: Dict[str, Any]) -> bytes:
+    """Encode one message for persistence; orjson emits bytes directly"""
+    if orjson is not None:
+        return orjson.dumps(message)
+    return json.dumps(message, separators=(",", ":")).encode()
+
+def _loads(raw: bytes) -> Dict[str, Any]:
+    """Decode one persisted message"""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+class ConversationStore(ABC):
+    """Backend for hot conversation state shared across workers
+
+    The in-process dicts in ConversationManager cap scale to one event
+    loop; a store keyed by user_id lets multiple workers share recent
+    history and the active flag.
+    """
+
+    @abstractmethod
+    async def append(self, user_id: str, message: Dict[str, Any]):
+        """Append one message to the user's recent history"""
+        pass
+
+    @abstractmethod
+    async def recent(self, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Return the user's most recent messages, oldest first"""
+        pass
+
+    @abstractmethod
+    async def set_active(self, user_id: str, active: bool):
+        """Mark the user's session active or ended"""
+        pass
+
+    @abstractmethod
+    async def is_active(self, user_id: str) -> bool:
+        """Check whether the user's session is active"""
+        pass
+
+    @abstractmethod
+    async def drop(self, user_id: str):
+        """Remove all stored state for the user"""
+        pass
+
+class InMemoryConversationStore(ConversationStore):
+    """Single-process store with the same interface as a shared backend"""
+
+    def __init__(self, max_recent: int = 30):
+        self._history: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=max_recent)
+        )
+        self._active: Dict[str, bool] = {}
+
+    async def append(self, user_id: str, message: Dict[str, Any]):
+        self._history[user_id].append(message)
+
+    async def recent(self, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        history = self._history.get(user_id, ())
+        return list(history)[-limit:]
+
+    async def set_active(self, user_id: str, active: bool):
+        self._active[user_id] = active
+
+    async def is_active(self, user_id: str) -> bool:
+        return self._active.get(user_id, False)
+
+    async def drop(self, user_id: str):
+        self._history.pop(user_id, None)
+        self._active.pop(user_id, None)
+
+class RedisConversationStore(ConversationStore):
+    """Redis-backed store; user_id keying shards naturally across a
+    cluster via consistent hashing of the key"""
+
+    def __init__(self, url: str = "redis://localhost:6379",
+                 max_recent: int = 30, active_ttl: int = 86400):
+        if aioredis is None:
+            raise ImportError("redis package not installed. Please install with: pip install redis")
+        self._redis = aioredis.from_url(url)
+        self.max_recent = max_recent
+        self.active_ttl = active_ttl
+
+    async def append(self, user_id: str, message: Dict[str, Any]):
+        key = f"chat:{user_id}:recent"
+        pipe = self._redis.pipeline()
+        pipe.rpush(key, _dumps(message))
+        pipe.ltrim(key, -self.max_recent, -1)
+        await pipe.execute()
+
+    async def recent(self, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        raw = await self._redis.lrange(f"chat:{user_id}:recent", -limit, -1)
+        return [_loads(item) for item in raw]
+
+    async def set_active(self, user_id: str, active: bool):
+        key = f"chat:{user_id}:active"
+        if active:
+            await self._redis.set(key, b"1", ex=self.active_ttl)
+        else:
+            await self._redis.delete(key)
+
+    async def is_active(self, user_id: str) -> bool:
+        return await self._redis.exists(f"chat:{user_id}:active") > 0
+
+    async def drop(self, user_id: str):
+        await self._redis.delete(
+            f"chat:{user_id}:recent", f"chat:{user_id}:active"
+        )
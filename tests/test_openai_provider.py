@@ -27,8 +27,11 @@ except ImportError:
 
 class OpenAIProviderTest:
     def __init__(self):
-        self.provider = None
-        self.factory = None
+        # One provider and factory for the whole suite: client setup
+        # (HTTP pool, config) happens once and keep-alive connections
+        # are reused across tests
+        self.provider = OpenAIProvider()
+        self.factory = LLMProviderFactory()
         
     async def test_api_key_validation(self):
         """Test 1: API Key Validation"""
@@ -36,12 +39,11 @@ class OpenAIProviderTest:
         print("-" * 40)
         
         try:
-            provider = OpenAIProvider()
-            api_key = provider.get_api_key()
+            api_key = self.provider.get_api_key()
             
             if api_key:
                 print(f"✅ API key found: {api_key[:8]}...{api_key[-4:] if len(api_key) > 12 else '***'}")
-                print(f"✅ API key validation: {provider.validate_api_key()}")
+                print(f"✅ API key validation: {self.provider.validate_api_key()}")
                 return True
             else:
                 print("❌ No API key found in environment variables")
@@ -58,8 +60,6 @@ class OpenAIProviderTest:
         print("-" * 40)
         
         try:
-            self.provider = OpenAIProvider()
-            
             # Test default model
             default_model = self.provider.get_default_model()
             print(f"✅ Default model: {default_model}")
@@ -82,8 +82,6 @@ class OpenAIProviderTest:
         print("-" * 40)
         
         try:
-            self.factory = LLMProviderFactory()
-            
             # Test provider validation
             validation_status = self.factory.validate_all_providers()
             print(f"✅ Validation status: {validation_status}")
@@ -266,24 +264,36 @@ class OpenAIProviderTest:
         print("🚀 Starting OpenAI Provider Tests")
         print("=" * 50)
         
-        tests = [
-            ("API Key Validation", self.test_api_key_validation),
-            ("Provider Initialization", self.test_provider_initialization),
-            ("Factory Integration", self.test_factory_integration),
-            ("Text Generation", self.test_text_generation),
-            ("Tool Calling", self.test_tool_calling),
-            ("Error Handling", self.test_error_handling)
+        # Tests 1-3 are independent of each other; tests 4-6 need
+        # self.provider from test 2 but not each other. Each group runs
+        # concurrently so wall time approaches the slowest test in the
+        # group instead of the sum.
+        groups = [
+            [
+                ("API Key Validation", self.test_api_key_validation),
+                ("Provider Initialization", self.test_provider_initialization),
+                ("Factory Integration", self.test_factory_integration),
+            ],
+            [
+                ("Text Generation", self.test_text_generation),
+                ("Tool Calling", self.test_tool_calling),
+                ("Error Handling", self.test_error_handling),
+            ],
         ]
         
         results = []
         
-        for test_name, test_func in tests:
-            try:
-                result = await test_func()
-                results.append((test_name, result))
-            except Exception as e:
-                print(f"❌ Test '{test_name}' crashed: {e}")
-                results.append((test_name, False))
+        for group in groups:
+            outcomes = await asyncio.gather(
+                *(test_func() for _, test_func in group),
+                return_exceptions=True
+            )
+            for (test_name, _), outcome in zip(group, outcomes):
+                if isinstance(outcome, BaseException):
+                    print(f"❌ Test '{test_name}' crashed: {outcome}")
+                    results.append((test_name, False))
+                else:
+                    results.append((test_name, outcome))
         
         # Print summary
         print("\n" + "=" * 50)
@@ -1,45 +1,189 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Mapping, Optional
+import ast
+import copy
 import json
+import os
+import re
+import tempfile
+import time
 import asyncio
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
 from datetime import datetime
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a tool payload to bytes; orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+def _loads(raw: bytes) -> Any:
+    """Deserialize a tool payload"""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+from functools import lru_cache
+from hashlib import blake2b, sha256
+from types import MappingProxyType
+
+# Request-type tags per tool: INFORMATIONAL calls are side-effect-free
+# and safe to cache or replay; COMMAND calls perform an action and must
+# always reach the backend exactly once
+INFORMATIONAL = "INFORMATIONAL"
+COMMAND = "COMMAND"
+
+# How long cached INFORMATIONAL results stay valid
+TOOL_CACHE_TTL = float(os.getenv("TOOL_CACHE_TTL", "3600"))
+
+# Scales every simulated tool delay; tests export
+# TOOL_SIM_LATENCY_MULT=0 to drop the sleeps entirely
+_SIM_MULT = float(os.getenv("TOOL_SIM_LATENCY_MULT", "1.0"))
+
+async def _simulated_delay(seconds: float):
+    """Sleep for the scaled simulated latency, skipping zero outright"""
+    delay = seconds * _SIM_MULT
+    if delay:
+        await asyncio.sleep(delay)
+
+class _GroupedToolCache:
+    """Two-level LRU keyed by a primary parameter, then the full call
+    
+    Grouping entries by their dominant parameter (table name, leading
+    query token) lets callers invalidate one group — e.g. every cached
+    "users" query after a user update — without flushing the rest.
+    Each group is its own LRU capped at per_group_max.
+    """
+    
+    def __init__(self, per_group_max: int = 64, ttl: float = None):
+        self.per_group_max = per_group_max
+        self.ttl = TOOL_CACHE_TTL if ttl is None else ttl
+        self._groups: Dict[str, OrderedDict] = defaultdict(OrderedDict)
+    
+    def get(self, group: str, key: bytes):
+        entries = self._groups.get(group)
+        if entries is None:
+            return None
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        expiry, value = entry
+        if expiry < time.monotonic():
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+        return value
+    
+    def set(self, group: str, key: bytes, value: Any):
+        entries = self._groups[group]
+        entries[key] = (time.monotonic() + self.ttl, value)
+        if len(entries) > self.per_group_max:
+            entries.popitem(last=False)
+    
+    def invalidate(self, group: str):
+        """Drop every cached entry in one group"""
+        self._groups.pop(group, None)
+
+_WORD_RE = re.compile(r"\w+")
+
+@lru_cache(maxsize=512)
+def _tokenize(query: str) -> FrozenSet[str]:
+    """Lowercase word tokens of a query; memoized for repeat queries"""
+    return frozenset(_WORD_RE.findall(query.lower()))
+
+def _tool_cache_key(name: str, kwargs: Dict[str, Any]) -> bytes:
+    """Stable digest for one tool invocation, shared by all tool caches
+    
+    blake2b over the canonical JSON of (name, kwargs); 16 bytes is
+    ample for in-process key uniqueness and hashes faster than sha256.
+    """
+    return blake2b(_dumps([name, kwargs]), digest_size=16).digest()
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    """Static portion of one simulated search result
+    
+    Frozen and slotted so the template instances built at import time
+    are immutable, compact and safely shared across calls.
+    """
+    title: str
+    url: str
+    snippet: str
+    source: str
+
+# Simulated search result templates; only the entries actually
+# requested are rendered per call
+_SEARCH_TEMPLATES = (
+    SearchResult(
+        "Result 1 for '{q}'", "https://example.com/result1",
+        "This is a comprehensive overview of {q} with detailed information.",
+        "example.com"),
+    SearchResult(
+        "Latest news about {q}", "https://news.example.com/article",
+        "Recent developments and trends related to {q}.",
+        "news.example.com"),
+    SearchResult(
+        "Expert analysis: {q}", "https://expert.example.com/analysis",
+        "In-depth expert analysis and professional insights on {q}.",
+        "expert.example.com"),
+)
 
 class WebSearchTool:
     """Tool for searching the web for information"""
     
+    REQUEST_TYPE = INFORMATIONAL
+    
+    # Past searches grouped by leading query token; results are
+    # deterministic for a given query, so repeats skip the simulated
+    # API round trip and whole topics can be invalidated together
+    def __init__(self):
+        self._cache = _GroupedToolCache()
+    
+    def invalidate(self, group: str):
+        """Drop cached searches whose query starts with the given token"""
+        self._cache.invalidate(group)
+    
     async def __call__(self, query: str, max_results: int = 5) -> List[Dict]:
         """Search the web for information"""
+        normalized = query.lower().strip()
+        group = normalized.split(None, 1)[0] if normalized else ""
+        cache_key = _tool_cache_key(
+            "web_search",
+            {"query": normalized, "max_results": max_results}
+        )
+        if self.REQUEST_TYPE == INFORMATIONAL:
+            cached = self._cache.get(group, cache_key)
+            if cached is not None:
+                # Deep copy so callers mutating results can't poison the cache
+                return copy.deepcopy(cached)
+        
         # Simulate web search - in production, integrate with actual search APIs
-        await asyncio.sleep(0.5)  # Simulate API delay
+        await _simulated_delay(0.5)  # Simulate API delay
         
-        simulated_results = [
-            {
-                "title": f"Result 1 for '{query}'",
-                "url": "https://example.com/result1",
-                "snippet": f"This is a comprehensive overview of {query} with detailed information.",
-                "source": "example.com",
-                "date": datetime.now().isoformat()
-            },
+        # One clock read per invocation, shared by every result; the
+        # template slice means entries beyond max_results are never built
+        now_iso = datetime.now().isoformat()
+        results = [
             {
-                "title": f"Latest news about {query}",
-                "url": "https://news.example.com/article",
-                "snippet": f"Recent developments and trends related to {query}.",
-                "source": "news.example.com",
-                "date": datetime.now().isoformat()
-            },
-            {
-                "title": f"Expert analysis: {query}",
-                "url": "https://expert.example.com/analysis", 
-                "snippet": f"In-depth expert analysis and professional insights on {query}.",
-                "source": "expert.example.com",
-                "date": datetime.now().isoformat()
+                "title": template.title.format(q=query),
+                "url": template.url,
+                "snippet": template.snippet.format(q=query),
+                "source": template.source,
+                "date": now_iso
             }
+            for template in _SEARCH_TEMPLATES[:max_results]
         ]
-        
-        return simulated_results[:max_results]
+        # Timestamps were frozen above, so the cached entry stays stable
+        self._cache.set(group, cache_key, copy.deepcopy(results))
+        return results
 
 class DatabaseQueryTool:
     """Tool for querying databases"""
     
+    REQUEST_TYPE = INFORMATIONAL
+    
     def __init__(self):
         # Simulate a database with sample data
         self.mock_database = {
@@ -54,43 +198,137 @@ class DatabaseQueryTool:
                 {"id": 3, "name": "Coffee", "price": 4.99, "category": "food"}
             ]
         }
+        # Secondary indexes built once so filtered queries are a dict
+        # lookup instead of a scan-and-allocate per call
+        self._users_by_role: Dict[str, List[Dict]] = {}
+        for user in self.mock_database["users"]:
+            self._users_by_role.setdefault(user["role"], []).append(user)
+        self._products_by_category: Dict[str, List[Dict]] = {}
+        for product in self.mock_database["products"]:
+            self._products_by_category.setdefault(product["category"], []).append(product)
+        # Query results grouped by table so a write to one table can
+        # invalidate just that table's cached reads
+        self._cache = _GroupedToolCache()
+    
+    def invalidate(self, group: str):
+        """Drop cached queries against one table"""
+        self._cache.invalidate(group)
     
     async def __call__(self, query: str, database: str = "main") -> List[Dict]:
         """Query database for information"""
-        await asyncio.sleep(0.2)  # Simulate query time
+        # Parse simple queries - in production, use proper SQL parsing.
+        # One tokenization pass replaces repeated substring scans; the
+        # branch tests below are O(1) set membership.
+        tokens = _tokenize(query)
+        if "users" in tokens:
+            group = "users"
+        elif "products" in tokens:
+            group = "products"
+        else:
+            group = "other"
         
-        # Parse simple queries - in production, use proper SQL parsing
-        query_lower = query.lower()
+        cache_key = _tool_cache_key(
+            "database_query", {"query": query.lower(), "database": database}
+        )
+        cached = self._cache.get(group, cache_key)
+        if cached is not None:
+            # Deep copy so callers mutating rows can't poison the cache
+            return copy.deepcopy(cached)
         
-        if "users" in query_lower:
-            if "admin" in query_lower:
-                return [user for user in self.mock_database["users"] if user["role"] == "admin"]
-            return self.mock_database["users"]
+        await _simulated_delay(0.2)  # Simulate query time
         
-        elif "products" in query_lower:
-            if "electronics" in query_lower:
-                return [product for product in self.mock_database["products"] if product["category"] == "electronics"]
-            return self.mock_database["products"]
+        if group == "users":
+            if "admin" in tokens:
+                result = self._users_by_role.get("admin", [])
+            else:
+                result = self.mock_database["users"]
+        elif group == "products":
+            if "electronics" in tokens:
+                result = self._products_by_category.get("electronics", [])
+            else:
+                result = self.mock_database["products"]
         else:
-            return [{"error": f"Could not parse query: {query}"}]
+            result = [{"error": f"Could not parse query: {query}"}]
+        
+        # Copy on store too: the branches above hand back the shared
+        # index lists, which must never leak by reference
+        self._cache.set(group, cache_key, copy.deepcopy(result))
+        return copy.deepcopy(result)
+
+# Extension-to-type table: one suffix split and dict probe instead of
+# a chain of endswith scans
+_EXT_MAP = {".pdf": "pdf", ".txt": "text", ".json": "json"}
 
 class FileReaderTool:
     """Tool for reading and processing files"""
     
+    REQUEST_TYPE = INFORMATIONAL
+    
+    def __init__(self):
+        # Results persist across process runs keyed by path + mtime +
+        # size, so unchanged files skip reprocessing on the next run
+        self._cache_dir = Path(os.getenv("FILE_READER_CACHE", ".filereader_cache"))
+    
+    def _disk_key(self, file_path: str, file_type: str) -> str:
+        """Cache key tied to the call arguments and the file's version
+        
+        The result depends on file_type as well as the path, so the
+        full kwargs digest is combined with the stat-based identity.
+        """
+        call_key = _tool_cache_key(
+            "file_reader", {"file_path": file_path, "file_type": file_type}
+        ).hex()
+        try:
+            st = os.stat(file_path)
+            identity = f"{call_key}:{st.st_mtime_ns}:{st.st_size}"
+        except OSError:
+            # Simulated/virtual paths have no stat; key on the call alone
+            identity = call_key
+        return sha256(identity.encode()).hexdigest()
+    
+    def _disk_read(self, cache_path: Path) -> Optional[Dict[str, Any]]:
+        """Load one cached result; stale, missing or corrupt files miss
+
+        Entries older than TOOL_CACHE_TTL expire. Non-stat-able
+        (simulated) paths key on the call arguments alone, so without
+        an expiry the first result — timestamps included — would be
+        served forever across runs.
+        """
+        try:
+            if time.time() - cache_path.stat().st_mtime > TOOL_CACHE_TTL:
+                cache_path.unlink(missing_ok=True)
+                return None
+            return _loads(cache_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+    
+    def _disk_write(self, cache_path: Path, result: Dict[str, Any]):
+        """Atomically persist one result; failures never break the call"""
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(_dumps(result))
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+    
     async def __call__(self, file_path: str, file_type: str = "auto") -> Dict[str, Any]:
         """Read and process file content"""
-        await asyncio.sleep(0.3)  # Simulate file reading
+        cache_path = self._cache_dir / f"{self._disk_key(file_path, file_type)}.json"
+        cached = await asyncio.to_thread(self._disk_read, cache_path)
+        if cached is not None:
+            return cached
+        
+        await _simulated_delay(0.3)  # Simulate file reading
+        
+        now_iso = datetime.now().isoformat()
         
         # Simulate file reading - in production, read actual files
         if file_type == "auto":
-            if file_path.endswith('.pdf'):
-                file_type = "pdf"
-            elif file_path.endswith('.txt'):
-                file_type = "text"
-            elif file_path.endswith('.json'):
-                file_type = "json"
-            else:
-                file_type = "unknown"
+            file_type = _EXT_MAP.get(
+                os.path.splitext(file_path)[1].lower(), "unknown"
+            )
         
         simulated_content = {
             "file_path": file_path,
@@ -98,8 +336,8 @@ class FileReaderTool:
             "content": f"Simulated content from {file_path}",
             "metadata": {
                 "size": "1024 bytes",
-                "created": datetime.now().isoformat(),
-                "processed": datetime.now().isoformat()
+                "created": now_iso,
+                "processed": now_iso
             }
         }
         
@@ -109,21 +347,53 @@ class FileReaderTool:
         elif file_type == "json":
             simulated_content["parsed_data"] = {"sample": "data", "from": file_path}
         
+        await asyncio.to_thread(self._disk_write, cache_path, simulated_content)
         return simulated_content
 
+# Node whitelist for calculator expressions: arithmetic only, no names,
+# calls or subscripts, so the compiled code can run with empty builtins
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow,
+    ast.USub, ast.UAdd
+)
+
+# Validated, compiled code objects keyed by expression text; repeats
+# skip the parse/validate/compile pipeline entirely
+_EXPR_CACHE: Dict[str, Any] = {}
+_EXPR_CACHE_MAX = 512
+
+def _compile_expression(expression: str):
+    """Parse, whitelist-check and compile one arithmetic expression"""
+    code = _EXPR_CACHE.get(expression)
+    if code is not None:
+        return code
+    tree = ast.parse(expression, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported element in expression: {type(node).__name__}")
+        # Constant admits any literal type; only numbers may evaluate
+        # (e.g. 'a' * 10**8 would otherwise allocate a huge string)
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise ValueError(f"Non-numeric constant in expression: {node.value!r}")
+    code = compile(tree, "<calc>", "eval")
+    if len(_EXPR_CACHE) >= _EXPR_CACHE_MAX:
+        _EXPR_CACHE.clear()
+    _EXPR_CACHE[expression] = code
+    return code
+
 class CalculatorTool:
     """Tool for mathematical calculations"""
     
+    REQUEST_TYPE = INFORMATIONAL
+    
     async def __call__(self, expression: str, precision: int = 2) -> Dict[str, Any]:
         """Perform mathematical calculations"""
         try:
-            # Simple calculator - in production, use a proper math parser
-            # Only allow basic operations for security
-            allowed_chars = set("0123456789+-*/.() ")
-            if not all(c in allowed_chars for c in expression):
-                return {"error": "Invalid characters in expression"}
-            
-            result = eval(expression)
+            # Restricted AST evaluation: only whitelisted arithmetic
+            # nodes compile, and the code runs without builtins
+            code = _compile_expression(expression)
+            result = eval(code, {"__builtins__": {}}, {})
             rounded_result = round(result, precision)
             
             return {
@@ -136,222 +406,322 @@ class CalculatorTool:
         except Exception as e:
             return {"error": f"Calculation error: {str(e)}"}
 
+def _first_n_sentences(text: str, n: int) -> str:
+    """Slice the text at the end of its nth sentence without splitting
+    
+    Walks period positions with str.find so only one substring is ever
+    allocated, instead of materializing every sentence in a list.
+    """
+    idx = 0
+    for _ in range(n):
+        nxt = text.find('.', idx)
+        if nxt < 0:
+            return text
+        idx = nxt + 1
+    return text[:idx]
+
+def _summarize(text: str, max_length: int, style: str) -> tuple:
+    """Pure summarization core: returns (summary, summary length)
+    
+    Kept free of self/await so the hot string work can be profiled or
+    compiled (e.g. with Cython) independently of the async wrapper.
+    """
+    if style == "brief":
+        summary = _first_n_sentences(text, 2)
+    elif style == "detailed":
+        summary = _first_n_sentences(text, 4)
+    else:
+        summary = text[:max_length] + "..." if len(text) > max_length else text
+    return summary, len(summary)
+
 class TextSummarizerTool:
     """Tool for summarizing text content"""
     
+    REQUEST_TYPE = INFORMATIONAL
+    
     async def __call__(self, text: str, max_length: int = 100, style: str = "brief") -> Dict[str, Any]:
         """Summarize text content"""
-        await asyncio.sleep(0.4)  # Simulate processing time
+        await _simulated_delay(0.4)  # Simulate processing time
         
         # Simple summarization - in production, use LLM or NLP library
-        sentences = text.split('.')
-        
-        if style == "brief":
-            summary = '. '.join(sentences[:2]) + '.' if len(sentences) > 2 else text
-        elif style == "detailed":
-            summary = '. '.join(sentences[:4]) + '.' if len(sentences) > 4 else text
-        else:
-            summary = text[:max_length] + "..." if len(text) > max_length else text
+        text_len = len(text)
+        summary, summary_len = _summarize(text, max_length, style)
         
         return {
             "original_text": text,
             "summary": summary,
-            "original_length": len(text),
-            "summary_length": len(summary),
+            "original_length": text_len,
+            "summary_length": summary_len,
             "style": style,
-            "compression_ratio": round(len(summary) / len(text), 2) if text else 0
+            "compression_ratio": round(summary_len / text_len, 2) if text else 0
         }
 
 class EmailSenderTool:
     """Tool for sending emails"""
     
+    REQUEST_TYPE = COMMAND
+    
     async def __call__(self, to: str, subject: str, body: str, cc: Optional[str] = None) -> Dict[str, Any]:
         """Send email (simulated)"""
-        await asyncio.sleep(1.0)  # Simulate email sending
+        # Validate before the simulated send so bad addresses fail in
+        # microseconds instead of waiting out the full send delay
+        if "@" not in to:
+            return {
+                "to": to,
+                "subject": subject,
+                "body": body,
+                "cc": cc,
+                "sent_at": datetime.now().isoformat(),
+                "status": "failed",
+                "error": "Invalid email address"
+            }
+        
+        await _simulated_delay(1.0)  # Simulate email sending
         
         # Simulate email sending - in production, integrate with email service
-        email_data = {
+        # Single clock read feeds both the timestamp and the message id
+        now = datetime.now()
+        return {
             "to": to,
             "subject": subject,
             "body": body,
             "cc": cc,
-            "sent_at": datetime.now().isoformat(),
-            "message_id": f"msg_{datetime.now().timestamp()}",
+            "sent_at": now.isoformat(),
+            "message_id": f"msg_{now.timestamp()}",
             "status": "sent"
         }
-        
-        # Simulate some basic validation
-        if "@" not in to:
-            email_data["status"] = "failed"
-            email_data["error"] = "Invalid email address"
-        
-        return email_data
 
 class SchedulerTool:
     """Tool for scheduling and calendar operations"""
     
+    # Mutating actions must never be cached; only reads are safe
+    REQUEST_TYPE = COMMAND
+    INFORMATIONAL_ACTIONS = frozenset({"list_events"})
+    
+    @classmethod
+    def request_type(cls, action: str) -> str:
+        """Classify one action; list_events is a side-effect-free read"""
+        return INFORMATIONAL if action in cls.INFORMATIONAL_ACTIONS else COMMAND
+    
     def __init__(self):
-        self.mock_calendar = []
+        # Events keyed by id: O(1) delete, insertion order preserved
+        self._events: Dict[str, Dict] = {}
+        self._next_id = 1
     
     async def __call__(self, action: str, **kwargs) -> Dict[str, Any]:
         """Perform calendar/scheduling operations"""
-        await asyncio.sleep(0.3)
+        await _simulated_delay(0.3)
         
         if action == "create_event":
+            event_id = f"event_{self._next_id}"
+            self._next_id += 1
             event = {
-                "id": f"event_{len(self.mock_calendar) + 1}",
+                "id": event_id,
                 "title": kwargs.get("title", "New Event"),
                 "start_time": kwargs.get("start_time"),
                 "end_time": kwargs.get("end_time"),
                 "description": kwargs.get("description", ""),
                 "created_at": datetime.now().isoformat()
             }
-            self.mock_calendar.append(event)
+            self._events[event_id] = event
             return {"action": "create_event", "event": event, "status": "created"}
         
         elif action == "list_events":
-            return {"action": "list_events", "events": self.mock_calendar}
+            return {"action": "list_events", "events": list(self._events.values())}
         
         elif action == "delete_event":
             event_id = kwargs.get("event_id")
-            self.mock_calendar = [e for e in self.mock_calendar if e["id"] != event_id]
+            self._events.pop(event_id, None)
             return {"action": "delete_event", "event_id": event_id, "status": "deleted"}
         
         else:
             return {"error": f"Unknown action: {action}"}
 
-# Tool registration helper
-def get_default_tools() -> Dict[str, Dict]:
-    """Get default tool configurations"""
-    return {
-        "web_search": {
-            "instance": WebSearchTool(),
-            "schema": {
-                "type": "function",
-                "function": {
-                    "name": "web_search",
-                    "description": "Search the web for information",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Search query"
-                            },
-                            "max_results": {
-                                "type": "integer",
-                                "description": "Maximum number of results",
-                                "default": 5
-                            }
-                        },
-                        "required": ["query"]
+# Tool classes behind each default entry, in registration order
+_TOOL_CLASSES = {
+    "web_search": WebSearchTool,
+    "database_query": DatabaseQueryTool,
+    "file_reader": FileReaderTool,
+    "calculator": CalculatorTool,
+    "text_summarizer": TextSummarizerTool,
+}
+
+# Schemas are static, so they are built once at import time instead of
+# being reallocated on every enumeration
+_DEFAULT_SCHEMAS: Dict[str, Dict] = {
+    "web_search": {
+        "type": "function",
+        "function": {
+            "name": "web_search",
+            "description": "Search the web for information",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Search query"
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "description": "Maximum number of results",
+                        "default": 5
                     }
-                }
+                },
+                "required": ["query"]
             }
-        },
-        "database_query": {
-            "instance": DatabaseQueryTool(),
-            "schema": {
-                "type": "function", 
-                "function": {
-                    "name": "database_query",
-                    "description": "Query database for information",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Database query"
-                            },
-                            "database": {
-                                "type": "string",
-                                "description": "Database name",
-                                "default": "main"
-                            }
-                        },
-                        "required": ["query"]
+        }
+    },
+    "database_query": {
+        "type": "function",
+        "function": {
+            "name": "database_query",
+            "description": "Query database for information",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Database query"
+                    },
+                    "database": {
+                        "type": "string",
+                        "description": "Database name",
+                        "default": "main"
                     }
-                }
+                },
+                "required": ["query"]
             }
-        },
-        "file_reader": {
-            "instance": FileReaderTool(),
-            "schema": {
-                "type": "function",
-                "function": {
-                    "name": "file_reader",
-                    "description": "Read and process files",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "file_path": {
-                                "type": "string",
-                                "description": "Path to the file"
-                            },
-                            "file_type": {
-                                "type": "string",
-                                "description": "File type (auto, pdf, text, json)",
-                                "default": "auto"
-                            }
-                        },
-                        "required": ["file_path"]
+        }
+    },
+    "file_reader": {
+        "type": "function",
+        "function": {
+            "name": "file_reader",
+            "description": "Read and process files",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_path": {
+                        "type": "string",
+                        "description": "Path to the file"
+                    },
+                    "file_type": {
+                        "type": "string",
+                        "description": "File type (auto, pdf, text, json)",
+                        "default": "auto"
                     }
-                }
+                },
+                "required": ["file_path"]
             }
-        },
-        "calculator": {
-            "instance": CalculatorTool(),
-            "schema": {
-                "type": "function",
-                "function": {
-                    "name": "calculator",
-                    "description": "Perform mathematical calculations",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "expression": {
-                                "type": "string",
-                                "description": "Mathematical expression to evaluate"
-                            },
-                            "precision": {
-                                "type": "integer",
-                                "description": "Decimal precision",
-                                "default": 2
-                            }
-                        },
-                        "required": ["expression"]
+        }
+    },
+    "calculator": {
+        "type": "function",
+        "function": {
+            "name": "calculator",
+            "description": "Perform mathematical calculations",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "expression": {
+                        "type": "string",
+                        "description": "Mathematical expression to evaluate"
+                    },
+                    "precision": {
+                        "type": "integer",
+                        "description": "Decimal precision",
+                        "default": 2
                     }
-                }
+                },
+                "required": ["expression"]
             }
-        },
-        "text_summarizer": {
-            "instance": TextSummarizerTool(),
-            "schema": {
-                "type": "function",
-                "function": {
-                    "name": "text_summarizer",
-                    "description": "Summarize text content",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "text": {
-                                "type": "string",
-                                "description": "Text to summarize"
-                            },
-                            "max_length": {
-                                "type": "integer",
-                                "description": "Maximum summary length",
-                                "default": 100
-                            },
-                            "style": {
-                                "type": "string",
-                                "description": "Summary style (brief, detailed, truncate)",
-                                "default": "brief"
-                            }
-                        },
-                        "required": ["text"]
+        }
+    },
+    "text_summarizer": {
+        "type": "function",
+        "function": {
+            "name": "text_summarizer",
+            "description": "Summarize text content",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "text": {
+                        "type": "string",
+                        "description": "Text to summarize"
+                    },
+                    "max_length": {
+                        "type": "integer",
+                        "description": "Maximum summary length",
+                        "default": 100
+                    },
+                    "style": {
+                        "type": "string",
+                        "description": "Summary style (brief, detailed, truncate)",
+                        "default": "brief"
                     }
-                }
+                },
+                "required": ["text"]
             }
         }
-    } 
\ No newline at end of file
+    }
+}
+
+# Immutable view over the shared instances and schemas, built lazily on
+# first use; every caller gets the same object
+_default_tools: Optional[Mapping[str, Mapping]] = None
+
+# Tool registration helper
+def get_default_tools() -> Mapping[str, Mapping]:
+    """Get default tool configurations
+    
+    Returns a read-only mapping shared by every caller; copy an entry
+    with dict(...) before mutating it.
+    """
+    global _default_tools
+    if _default_tools is None:
+        instances = {name: cls() for name, cls in _TOOL_CLASSES.items()}
+        _default_tools = MappingProxyType({
+            name: MappingProxyType(
+                {"instance": instances[name], "schema": _DEFAULT_SCHEMAS[name]}
+            )
+            for name in _DEFAULT_SCHEMAS
+        })
+    return _default_tools
+
+@dataclass(frozen=True)
+class ToolCall:
+    """One named tool invocation for batch execution"""
+    name: str
+    kwargs: Dict[str, Any]
+
+async def run_tools(calls: List[ToolCall]) -> List[Any]:
+    """Execute a batch of tool calls concurrently, deduplicating repeats
+    
+    Identical INFORMATIONAL calls within the batch collapse to a single
+    backend invocation whose result is fanned back to every duplicate;
+    COMMAND calls always execute individually. Results are returned in
+    call order.
+    """
+    tools = get_default_tools()
+    
+    # Group call indices by cache key; COMMAND calls get a unique key
+    # per position so they are never coalesced
+    groups: Dict[Any, List[int]] = {}
+    for i, call in enumerate(calls):
+        instance = tools[call.name]["instance"]
+        if getattr(instance, "REQUEST_TYPE", COMMAND) == INFORMATIONAL:
+            key = _tool_cache_key(call.name, call.kwargs)
+        else:
+            key = i
+        groups.setdefault(key, []).append(i)
+    
+    unique = [indices[0] for indices in groups.values()]
+    outcomes = await asyncio.gather(
+        *(tools[calls[i].name]["instance"](**calls[i].kwargs) for i in unique)
+    )
+    
+    results: List[Any] = [None] * len(calls)
+    for indices, outcome in zip(groups.values(), outcomes):
+        for i in indices:
+            results[i] = outcome
+    return results
@@ -1,164 +1,467 @@
-from typing import Dict, Any, Callable, List, Optional
+from typing import Dict, Any, Callable, List, Mapping, Optional
 import asyncio
 import inspect
+import logging
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+logger = logging.getLogger(__name__)
+
+class ToolResult:
+    """Slotted execution result with dict-style access
+    
+    Replaces the per-call result dict on the hot path; attribute
+    storage is cheaper to allocate, while __getitem__/get keep existing
+    callers that index like a dict working.
+    """
+    
+    __slots__ = ("success", "result", "error", "tool")
+    
+    def __init__(self, success: bool, tool: str, result: Any = None,
+                 error: Optional[str] = None):
+        self.success = success
+        self.tool = tool
+        self.result = result
+        self.error = error
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain-dict form for serialization"""
+        return {"success": self.success, "result": self.result,
+                "error": self.error, "tool": self.tool}
+
+def _build_dispatch(name: str, func: Callable,
+                    param_order: Optional[tuple]) -> Callable:
+    """Specialize an async dispatch closure for one tool
+    
+    The tool's function, name and parameter order are bound as cell
+    variables at registration, so per-call dispatch is one attribute
+    read and a call — no registry lookups and no exception escaping.
+    """
+    async def dispatch(arguments: Dict, _func=func, _name=name,
+                       _order=param_order) -> "ToolResult":
+        try:
+            if (_order is not None and len(arguments) == len(_order)
+                    and all(param in arguments for param in _order)):
+                result = _func(*(arguments[param] for param in _order))
+            else:
+                result = _func(**arguments)
+            if asyncio.iscoroutine(result):
+                result = await result
+            return ToolResult(True, _name, result=result)
+        except Exception as e:
+            return ToolResult(False, _name, error=str(e))
+    return dispatch
+
+def _freeze(obj: Any) -> Any:
+    """Recursively wrap dicts in read-only proxies and lists in tuples"""
+    if isinstance(obj, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(item) for item in obj)
+    return obj
+
+def _thaw(obj: Any) -> Any:
+    """Rebuild plain dicts and lists from a frozen schema
+    
+    Provider format builders must emit JSON-serializable payloads, and
+    neither json nor orjson accepts MappingProxyType.
+    """
+    if isinstance(obj, Mapping):
+        return {key: _thaw(value) for key, value in obj.items()}
+    if isinstance(obj, tuple):
+        return [_thaw(item) for item in obj]
+    return obj
+
+@lru_cache(maxsize=256)
+def _not_found_result(tool_name: str) -> ToolResult:
+    """Shared per-name result for the constant unknown-tool error"""
+    return ToolResult(False, tool_name, error=f"Tool {tool_name} not found")
+
+class ToolEntry:
+    """Everything known about one registered tool, in a single record
+    
+    Slotted so the hot dispatch path does one dict probe for the entry
+    and C-level attribute reads after, instead of a lookup per parallel
+    dict.
+    """
+    
+    __slots__ = ("func", "schema", "metadata", "is_async", "signature",
+                 "validator", "required_params", "required_set",
+                 "batch_func", "param_slots", "required_mask",
+                 "param_order", "dispatch")
+    
+    def __init__(self, func: Callable, schema: Dict, metadata: Dict, is_async: bool,
+                 batch_func: Optional[Callable] = None):
+        self.func = func
+        self.schema = schema
+        self.metadata = metadata
+        self.is_async = is_async
+        # Rendered once here; inspect.signature parses the code object
+        # and is far too slow to run per get_tool_info call. The same
+        # pass records the parameter order for positional dispatch when
+        # every parameter is a plain positional-or-keyword one.
+        self.param_order = None
+        try:
+            sig = inspect.signature(func)
+            self.signature = str(sig)
+            if all(param.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD
+                   for param in sig.parameters.values()):
+                self.param_order = tuple(sig.parameters)
+        except (TypeError, ValueError):
+            self.signature = "(...)"
+        # Compiled jsonschema validator when fastjsonschema is
+        # installed and the schema compiles; the required-name tuple is
+        # the always-available fallback check
+        parameters = schema.get("function", {}).get("parameters", {})
+        self.required_params = tuple(parameters.get("required", ()))
+        self.required_set = frozenset(self.required_params)
+        # Bit-slot encoding for bulk validation: each known parameter
+        # gets a bit, and the required set collapses to one int mask
+        names = list(parameters.get("properties", {}))
+        for required in self.required_params:
+            if required not in names:
+                names.append(required)
+        self.param_slots = {param: 1 << slot for slot, param in enumerate(names)}
+        self.required_mask = 0
+        for required in self.required_params:
+            self.required_mask |= self.param_slots[required]
+        self.validator = None
+        if fastjsonschema is not None:
+            try:
+                self.validator = fastjsonschema.compile(parameters)
+            except Exception:
+                self.validator = None
+        # Optional list-of-kwargs entry point; batches of calls to this
+        # tool collapse into one invocation when set
+        self.batch_func = batch_func
+        # Specialized dispatch closure, bound by the manager right
+        # after construction
+        self.dispatch: Optional[Callable] = None
 
 class ToolManager:
-    def __init__(self):
-        self.tools: Dict[str, Callable] = {}
-        self.tool_schemas: Dict[str, Dict] = {}
-        self.tool_metadata: Dict[str, Dict] = {}
-    
-    def register_tool(self, name: str, func: Callable, schema: Dict, metadata: Optional[Dict] = None):
-        """Register a new tool"""
-        self.tools[name] = func
-        self.tool_schemas[name] = schema
-        self.tool_metadata[name] = metadata or {}
-        print(f"Registered tool: {name}")
+    def __init__(self, max_concurrency: int = 32):
+        self.entries: Dict[str, ToolEntry] = {}
+        # Cap on in-flight executions per batch so a huge fan-out
+        # doesn't flood the loop (and any rate-limited backends); the
+        # semaphore is created lazily on the running loop
+        self.max_concurrency = max_concurrency
+        self._sem: Optional[asyncio.Semaphore] = None
+        # Registry version; bumped on every mutation so derived
+        # artifacts (provider tool formats) can be cached until stale
+        self._version = 0
+        self._openai_cache: Optional[tuple] = None
+        self._anthropic_cache: Optional[tuple] = None
+        self._schemas_view_cache: Optional[tuple] = None
+        self._info_cache: Dict[str, tuple] = {}
+    
+    @property
+    def tools(self) -> Dict[str, Callable]:
+        """Name-to-callable view for callers that want the plain dict"""
+        return {name: entry.func for name, entry in self.entries.items()}
+    
+    @property
+    def tool_schemas(self) -> Dict[str, Dict]:
+        """Name-to-schema view for callers that want the plain dict"""
+        return {name: entry.schema for name, entry in self.entries.items()}
+    
+    def register_tool(self, name: str, func: Callable, schema: Dict, metadata: Optional[Dict] = None,
+                      batch_func: Optional[Callable] = None):
+        """Register a new tool
+        
+        batch_func, when given, takes a list of argument dicts and
+        returns a result per dict; execute_multiple_tools uses it to
+        run a whole group of calls in one round trip.
+        """
+        # Interned names make later dict probes pointer-equality hits
+        name = sys.intern(name)
+        is_async = (
+            inspect.iscoroutinefunction(func)
+            or inspect.iscoroutinefunction(getattr(func, "__call__", None))
+        )
+        # Frozen at the door: every getter can hand the schema out by
+        # reference without defensive copies
+        entry = ToolEntry(
+            func, _freeze(dict(schema)), metadata or {}, is_async, batch_func
+        )
+        entry.dispatch = _build_dispatch(name, func, entry.param_order)
+        self.entries[name] = entry
+        self._version += 1
+        logger.debug("Registered tool: %s", name)
     
     async def execute_tool(self, name: str, arguments: Dict) -> Any:
         """Execute tool with given arguments"""
-        if name not in self.tools:
+        entry = self.entries.get(sys.intern(name))
+        if entry is None:
             raise ValueError(f"Tool {name} not found")
         
-        func = self.tools[name]
-        
-        try:
-            # Check if the function is async
-            if inspect.iscoroutinefunction(func):
-                result = await func(**arguments)
-            else:
-                result = func(**arguments)
-            
-            return {
-                "success": True,
-                "result": result,
-                "tool": name
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "tool": name
-            }
+        return await entry.dispatch(arguments)
     
     def get_tool_schema(self, name: str) -> Dict:
         """Get tool schema for LLM tool calling"""
-        return self.tool_schemas.get(name, {})
+        entry = self.entries.get(name)
+        return entry.schema if entry is not None else {}
     
     def list_tools(self) -> List[str]:
         """List all registered tools"""
-        return list(self.tools.keys())
+        return list(self.entries.keys())
+    
+    def get_all_schemas(self) -> Mapping[str, Dict]:
+        """Get all tool schemas as a read-only view
+        
+        The view is cached per registry version; callers needing a
+        mutable dict should use get_all_schemas_copy.
+        """
+        cache = self._schemas_view_cache
+        if cache is not None and cache[0] == self._version:
+            return cache[1]
+        view = MappingProxyType(self.tool_schemas)
+        self._schemas_view_cache = (self._version, view)
+        return view
     
-    def get_all_schemas(self) -> Dict[str, Dict]:
-        """Get all tool schemas"""
-        return self.tool_schemas.copy()
+    def get_all_schemas_copy(self) -> Dict[str, Dict]:
+        """Get a mutable copy of all tool schemas"""
+        return self.tool_schemas
     
     def unregister_tool(self, name: str):
         """Unregister a tool"""
-        if name in self.tools:
-            del self.tools[name]
-            del self.tool_schemas[name]
-            del self.tool_metadata[name]
-            print(f"Unregistered tool: {name}")
+        if self.entries.pop(name, None) is not None:
+            self._version += 1
+            logger.debug("Unregistered tool: %s", name)
     
     def get_tool_info(self, name: str) -> Dict:
         """Get comprehensive information about a tool"""
-        if name not in self.tools:
+        # Version-tagged memo: agents introspect the same tools every
+        # turn, so repeat calls return the cached dict until the
+        # registry mutates
+        cached = self._info_cache.get(name)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        
+        entry = self.entries.get(name)
+        if entry is None:
             return {"error": f"Tool {name} not found"}
         
-        return {
+        info = {
             "name": name,
-            "schema": self.tool_schemas[name],
-            "metadata": self.tool_metadata[name],
-            "signature": str(inspect.signature(self.tools[name]))
+            "schema": entry.schema,
+            "metadata": entry.metadata,
+            "signature": entry.signature
         }
+        if len(self._info_cache) > 128:
+            self._info_cache.clear()
+        self._info_cache[name] = (self._version, info)
+        return info
+    
+    def set_concurrency(self, n: int):
+        """Tune the batch execution concurrency cap"""
+        self.max_concurrency = n
+        self._sem = None
+    
+    async def _bounded(self, coro) -> Any:
+        """Await one execution under the shared concurrency cap"""
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+        async with self._sem:
+            return await coro
+    
+    def _execute_sync(self, entry: ToolEntry, name: str, arguments: Dict) -> "ToolResult":
+        """Run one synchronous tool directly, no coroutine wrapping"""
+        try:
+            return ToolResult(True, name, result=entry.func(**arguments))
+        except Exception as e:
+            return ToolResult(False, name, error=str(e))
     
     async def execute_multiple_tools(self, tool_calls: List[Dict]) -> List[Dict]:
         """Execute multiple tools concurrently"""
-        tasks = []
+        entries = [
+            self.entries.get(sys.intern(name)) if isinstance(name := call.get("name"), str) else None
+            for call in tool_calls
+        ]
         
-        for call in tool_calls:
+        # Sync-only fast path: no coroutine, Task or gather overhead
+        # when nothing in the batch actually awaits
+        if not any(entry is not None and (entry.is_async or entry.batch_func is not None)
+                   for entry in entries):
+            results = []
+            for call, entry in zip(tool_calls, entries):
+                tool_name = call.get("name")
+                if entry is None:
+                    results.append(_not_found_result(tool_name or "unknown"))
+                else:
+                    results.append(self._execute_sync(entry, tool_name, call.get("arguments", {})))
+            return results
+        
+        # Mixed batch: sync tools run inline, batch-aware tools are
+        # grouped into one invocation each, and only the genuinely
+        # awaiting calls go through gather. Slots map gathered results
+        # back to their original positions (a list slot marks a group).
+        results: List[Optional[Dict]] = [None] * len(tool_calls)
+        coro_slots: List[Any] = []
+        coros = []
+        batch_groups: Dict[str, List[int]] = {}
+        for i, (call, entry) in enumerate(zip(tool_calls, entries)):
             tool_name = call.get("name")
             arguments = call.get("arguments", {})
-            
-            if tool_name in self.tools:
-                task = self.execute_tool(tool_name, arguments)
-                tasks.append(task)
+            if entry is None:
+                # Constant error; no reason to round-trip the scheduler
+                results[i] = _not_found_result(tool_name or "unknown")
+            elif entry.batch_func is not None:
+                batch_groups.setdefault(tool_name, []).append(i)
+            elif entry.is_async:
+                coro_slots.append(i)
+                coros.append(self._bounded(entry.dispatch(arguments)))
             else:
-                tasks.append(asyncio.create_task(self._return_error(tool_name or "unknown")))
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Convert exceptions to error results
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append({
-                    "success": False,
-                    "error": str(result),
-                    "tool": tool_calls[i].get("name", "unknown")
-                })
+                results[i] = self._execute_sync(entry, tool_name, arguments)
+        
+        for tool_name, indices in batch_groups.items():
+            coro_slots.append(indices)
+            coros.append(self._bounded(self._execute_batch(
+                self.entries[tool_name], tool_name,
+                [tool_calls[i].get("arguments", {}) for i in indices]
+            )))
+        
+        # Dispatch closures and _execute_batch never raise, so gather
+        # needs no exception mapping pass
+        gathered = await asyncio.gather(*coros)
+        for slot, result in zip(coro_slots, gathered):
+            if isinstance(slot, list):
+                for position, outcome in zip(slot, result):
+                    results[position] = outcome
             else:
-                processed_results.append(result)
+                results[slot] = result
         
-        return processed_results
+        return results
     
-    async def _return_error(self, tool_name: str) -> Dict:
-        """Return error for unknown tool"""
-        return {
-            "success": False,
-            "error": f"Tool {tool_name} not found",
-            "tool": tool_name
-        }
+    async def _execute_batch(self, entry: ToolEntry, name: str,
+                             args_list: List[Dict]) -> List["ToolResult"]:
+        """Run one batch-aware tool over a group of argument dicts"""
+        try:
+            outcomes = entry.batch_func(args_list)
+            if asyncio.iscoroutine(outcomes):
+                outcomes = await outcomes
+            return [ToolResult(True, name, result=outcome)
+                    for outcome in outcomes]
+        except Exception as e:
+            return [ToolResult(False, name, error=str(e))
+                    for _ in args_list]
     
     def validate_tool_call(self, name: str, arguments: Dict) -> Dict:
         """Validate a tool call without executing it"""
-        if name not in self.tools:
+        entry = self.entries.get(name)
+        if entry is None:
             return {"valid": False, "error": f"Tool {name} not found"}
         
-        schema = self.tool_schemas.get(name, {})
-        function_schema = schema.get("function", {})
-        parameters = function_schema.get("parameters", {})
-        
-        # Basic validation - in production, use jsonschema library
-        required_params = parameters.get("required", [])
+        # Full schema validation through the validator compiled at
+        # registration; without fastjsonschema, the precomputed
+        # required-name tuple still catches missing parameters
+        if entry.validator is not None:
+            try:
+                entry.validator(arguments)
+            except Exception as e:
+                return {"valid": False, "error": str(e)}
+            return {"valid": True}
         
-        missing_params = [param for param in required_params if param not in arguments]
+        # C-level set difference against the frozenset precomputed at
+        # registration; empty means every required parameter is present
+        missing = entry.required_set - arguments.keys()
         
-        if missing_params:
+        if missing:
             return {
                 "valid": False,
-                "error": f"Missing required parameters: {missing_params}"
+                "error": f"Missing required parameters: {sorted(missing)}"
             }
         
         return {"valid": True}
     
+    def validate_tool_calls_bulk(self, calls: List[Dict]) -> List[Dict]:
+        """Validate many tool calls with the precomputed bit masks
+        
+        Each call's provided arguments fold into an int mask that is
+        ANDed against the tool's required mask, so the inner loop is
+        integer ops rather than per-call schema walks. Suited to
+        pipelines that validate large batches before execution.
+        """
+        results = []
+        for call in calls:
+            name = call.get("name")
+            entry = self.entries.get(name)
+            if entry is None:
+                results.append({"valid": False, "error": f"Tool {name} not found"})
+                continue
+            
+            provided = 0
+            slots = entry.param_slots
+            for key in call.get("arguments", {}):
+                bit = slots.get(key)
+                if bit is not None:
+                    provided |= bit
+            missing_mask = entry.required_mask & ~provided
+            if missing_mask:
+                missing = [param for param in entry.required_params
+                           if missing_mask & entry.param_slots[param]]
+                results.append({
+                    "valid": False,
+                    "error": f"Missing required parameters: {missing}"
+                })
+            else:
+                results.append({"valid": True})
+        return results
+    
     def create_openai_tools_format(self) -> List[Dict]:
         """Convert tool schemas to OpenAI tools format"""
-        return list(self.tool_schemas.values())
+        cache = self._openai_cache
+        if cache is not None and cache[0] == self._version:
+            return cache[1]
+        # Thawed to plain dicts: this output goes straight into SDK
+        # request payloads, and the copy is paid once per registry change
+        tools = [_thaw(entry.schema) for entry in self.entries.values()]
+        self._openai_cache = (self._version, tools)
+        return tools
     
     def create_anthropic_tools_format(self) -> List[Dict]:
         """Convert tool schemas to Anthropic tools format"""
-        anthropic_tools = []
-        
-        for name, schema in self.tool_schemas.items():
-            if schema.get("type") == "function":
-                function = schema["function"]
-                anthropic_tool = {
-                    "name": function["name"],
-                    "description": function["description"],
-                    "input_schema": function["parameters"]
-                }
-                anthropic_tools.append(anthropic_tool)
+        cache = self._anthropic_cache
+        if cache is not None and cache[0] == self._version:
+            return cache[1]
+        
+        # Single filtered comprehension: C-level iteration with no
+        # incremental list growth
+        anthropic_tools = [
+            {
+                "name": schema["function"]["name"],
+                "description": schema["function"]["description"],
+                "input_schema": _thaw(schema["function"]["parameters"])
+            }
+            for schema in (entry.schema for entry in self.entries.values())
+            if schema.get("type") == "function"
+        ]
         
+        self._anthropic_cache = (self._version, anthropic_tools)
         return anthropic_tools
     
     async def get_tool_usage_stats(self) -> Dict[str, Any]:
         """Get usage statistics for all tools"""
         # In a real implementation, this would track actual usage
         return {
-            "total_tools": len(self.tools),
-            "tools": list(self.tools.keys()),
-            "schemas_count": len(self.tool_schemas),
-            "metadata_count": len(self.tool_metadata)
+            "total_tools": len(self.entries),
+            "tools": list(self.entries.keys()),
+            "schemas_count": len(self.entries),
+            "metadata_count": len(self.entries)
         } 
\ No newline at end of file